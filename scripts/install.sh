@@ -116,8 +116,14 @@ pip install \
     pydub \
     soundfile \
     numpy \
+    onnx \
     schedule \
-    gunicorn
+    gunicorn \
+    gevent
+
+# Piper-Stimme zusaetzlich als int8 quantisieren (schnellere CPU-Synthese)
+python "$(dirname "${BASH_SOURCE[0]}")/quantize_piper_voice.py" "$VOICE_DIR/de_DE-thorsten-high.onnx" \
+    || echo -e "${YELLOW}Quantisierung fehlgeschlagen - Original-Stimme wird genutzt.${NC}"
 
 deactivate
 echo -e "${GREEN}Python-Umgebung eingerichtet.${NC}"
@@ -183,7 +189,7 @@ Type=simple
 User=asterisk
 Group=asterisk
 WorkingDirectory=/opt/ki-telefonassistent
-ExecStart=/opt/ki-telefonassistent/venv/bin/gunicorn --bind 0.0.0.0:5000 --workers 2 src.web_dashboard:app
+ExecStart=/opt/ki-telefonassistent/venv/bin/gunicorn --bind 0.0.0.0:5000 -k gevent --workers 1 --worker-connections 1000 src.web_dashboard:app
 Restart=always
 RestartSec=5
 Environment=PYTHONUNBUFFERED=1
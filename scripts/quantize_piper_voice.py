@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Quantisiert eine Piper-Stimme (ONNX) dynamisch auf int8.
+Die int8-Stimme synthetisiert auf der CPU spuerbar schneller und braucht
+etwa halb so viel Speicher; TTSEngine nutzt sie automatisch, wenn sie
+neben der Original-Stimme liegt.
+
+Benoetigt onnxruntime (kommt mit faster-whisper) und das Paket onnx,
+das onnxruntime.quantization zum Laden des Modells importiert.
+
+Nutzung:
+    python scripts/quantize_piper_voice.py /opt/piper/voices/de_DE-thorsten-high.onnx
+"""
+
+import sys
+import shutil
+import argparse
+from pathlib import Path
+
+
+def int8_path(voice_path):
+    """de_DE-thorsten-high.onnx -> de_DE-thorsten-high.int8.onnx"""
+    return voice_path.with_name(voice_path.name[: -len(".onnx")] + ".int8.onnx")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Piper-Stimme auf int8 quantisieren")
+    parser.add_argument("voice", help="Pfad zur Piper-Stimme (.onnx)")
+    parser.add_argument("--force", action="store_true", help="Vorhandene int8-Stimme ueberschreiben")
+    args = parser.parse_args()
+
+    voice_path = Path(args.voice)
+    if not voice_path.exists() or voice_path.suffix != ".onnx":
+        print(f"Stimme nicht gefunden oder keine .onnx-Datei: {voice_path}")
+        sys.exit(1)
+
+    target = int8_path(voice_path)
+    if target.exists() and not args.force:
+        print(f"int8-Stimme existiert bereits: {target}")
+        return
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    print(f"Quantisiere {voice_path.name} -> {target.name} ...")
+    quantize_dynamic(str(voice_path), str(target), weight_type=QuantType.QInt8)
+
+    # Piper erwartet die Konfiguration als <modell>.json daneben
+    config = Path(str(voice_path) + ".json")
+    if config.exists():
+        shutil.copyfile(config, str(target) + ".json")
+
+    size_before = voice_path.stat().st_size / 1024 / 1024
+    size_after = target.stat().st_size / 1024 / 1024
+    print(f"Fertig: {size_before:.0f} MB -> {size_after:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
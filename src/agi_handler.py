@@ -15,7 +15,9 @@ import os
 import signal
 import time
 import logging
+import queue
 import tempfile
+import threading
 import subprocess
 from pathlib import Path
 
@@ -25,6 +27,7 @@ sys.path.insert(0, "/opt/ki-telefonassistent")
 from src.config_loader import load_config, load_business_config, build_system_prompt
 from src.stt_engine import init_stt, transcribe
 from src.llm_engine import create_llm_engine
+from src.sentences import iter_sentences
 from src.tts_engine import TTSEngine, create_tts_engine
 from src.call_database import (
     init_database, start_call, end_call,
@@ -122,6 +125,36 @@ class AsteriskAGI:
         return self.execute(f'VERBOSE "{message}" {level}')
 
 
+def prefetch_speech(tts, sentences, audio_base):
+    """
+    Liest die Saetze der LLM-Antwort in einem Hintergrund-Thread und startet
+    fuer jeden sofort die Synthese (tts.synthesize_async). So entsteht Satz N+1,
+    waehrend Satz N noch abgespielt wird.
+
+    Returns:
+        (Queue mit (satz, audio_basis, future), None am Ende; Stop-Event)
+    """
+    pending = queue.Queue()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for index, sentence in enumerate(sentences):
+                if stop.is_set():
+                    break
+                response_audio = f"{audio_base}_{index}"
+                future = tts.synthesize_async(sentence, response_audio + ".wav")
+                pending.put((sentence, response_audio, future))
+        except Exception as e:
+            logger.error(f"Fehler beim Vorbereiten der Antwort: {e}")
+        finally:
+            sentences.close()
+            pending.put(None)
+
+    threading.Thread(target=produce, name="prefetch-speech", daemon=True).start()
+    return pending, stop
+
+
 def run_conversation(agi, call_id, caller_number, config, business_config):
     """
     Führt die Konversation mit dem Anrufer.
@@ -162,6 +195,9 @@ def run_conversation(agi, call_id, caller_number, config, business_config):
         model_size=config["whisper_model"],
         device=config["whisper_device"],
         language=config["whisper_language"],
+        vad_model_path=config["whisper_vad_model"],
+        cpu_threads=config["whisper_cpu_threads"],
+        num_workers=config["whisper_num_workers"],
     )
     logger.info("Whisper STT bereit.")
 
@@ -209,7 +245,7 @@ def run_conversation(agi, call_id, caller_number, config, business_config):
         logger.info("Wartemusik gestartet")
 
         # --- Verstehen (Speech-to-Text) ---
-        stt_result = transcribe(str(record_wav), config["whisper_language"])
+        stt_result = transcribe(str(record_wav), config["whisper_language"], streaming=True)
         user_text = stt_result["text"].strip()
 
         if not user_text:
@@ -239,43 +275,69 @@ def run_conversation(agi, call_id, caller_number, config, business_config):
 
         # --- Antworten (LLM) ---
         # HINWEIS: Adressvalidierung deaktiviert - führte zu falschen Ergebnissen
-        llm_result = llm.generate_response(system_prompt, conversation[:-1], user_text)
-        response_text = llm_result["response"]
-
-        logger.info(f"KI antwortet: {response_text}")
-        save_message(call_id, "assistant", response_text)
-        conversation.append({"role": "assistant", "content": response_text})
-
-        # Prüfe ob KI das Gespräch beendet hat
+        # Die Antwort wird gestreamt und Satz für Satz gesprochen, damit der
+        # Anrufer nicht auf die komplette LLM-Antwort warten muss.
         ki_goodbye_phrases = [
             "auf wiederhören", "auf wiederhoeren", "wiederhören",
             "wiederhoeren", "einen schönen tag", "schoenen tag",
         ]
-        ki_ends_call = any(phrase in response_text.lower() for phrase in ki_goodbye_phrases)
+        ki_ends_call = False
+        tts_failed = False
+        interrupted = False
+        spoken = []
 
-        # Audio erzeugen
-        response_audio = audio_dir / f"{call_id}_response{turn}"
-        audio_file = tts.synthesize_to_asterisk_format(
-            response_text, str(response_audio) + ".wav"
+        sentences = iter_sentences(
+            llm.generate_response_stream(system_prompt, conversation[:-1], user_text)
         )
+        # Synthese laeuft einen Satz voraus, waehrend der aktuelle abgespielt wird
+        pending, stop_prefetch = prefetch_speech(
+            tts, sentences, audio_dir / f"{call_id}_response{turn}"
+        )
+        for index, (sentence, response_audio, future) in enumerate(iter(pending.get, None)):
+            spoken.append(sentence)
+
+            # Prüfe ob KI das Gespräch beendet
+            sentence_ends_call = any(phrase in sentence.lower() for phrase in ki_goodbye_phrases)
+            ki_ends_call = ki_ends_call or sentence_ends_call
 
-        # Wartemusik stoppen und Antwort abspielen
-        agi.set_music(on=False)
+            # Audio abholen (meist schon fertig)
+            audio_file = future.result()
+
+            # Wartemusik stoppen sobald der erste Satz bereit ist
+            if index == 0:
+                agi.set_music(on=False)
+
+            if not audio_file:
+                logger.error(f"TTS fehlgeschlagen für Runde {turn}")
+                tts_failed = True
+                break
 
-        if audio_file:
             # Barge-in: Anrufer kann mit beliebiger Taste unterbrechen (aber nicht bei Verabschiedung)
-            if ki_ends_call:
+            if sentence_ends_call:
                 # Bei Verabschiedung: komplett abspielen ohne Unterbrechung
-                agi.stream_file(str(response_audio))
-                logger.info("KI hat sich verabschiedet - Anruf wird beendet")
-                break
+                agi.stream_file(response_audio)
             else:
-                result = agi.stream_file(str(response_audio), escape_digits="0123456789#*")
+                result = agi.stream_file(response_audio, escape_digits="0123456789#*")
                 if result and "digit=" in result:
                     # Anrufer hat unterbrochen - weiter zur naechsten Aufnahme
                     logger.info(f"Anrufer hat Wiedergabe unterbrochen: {result}")
-        else:
-            logger.error(f"TTS fehlgeschlagen für Runde {turn}")
+                    interrupted = True
+                    break
+        stop_prefetch.set()
+
+        if not spoken:
+            # Keine Antwort erhalten - Wartemusik trotzdem beenden
+            agi.set_music(on=False)
+
+        response_text = " ".join(spoken)
+        logger.info(f"KI antwortet: {response_text}")
+        save_message(call_id, "assistant", response_text)
+        conversation.append({"role": "assistant", "content": response_text})
+
+        if tts_failed or not spoken:
+            break
+        if ki_ends_call and not interrupted:
+            logger.info("KI hat sich verabschiedet - Anruf wird beendet")
             break
 
     # --- Zusammenfassung ---
@@ -4,6 +4,7 @@ Speichert alle Anrufe, Gesprächsverläufe und extrahierte Informationen.
 """
 
 import os
+import socket
 import sqlite3
 import json
 import logging
@@ -14,6 +15,10 @@ logger = logging.getLogger(__name__)
 
 DB_PATH = Path(os.environ.get("KI_DB_PATH", "/opt/ki-telefonassistent/logs/calls.db"))
 
+# Aenderungs-Benachrichtigung zwischen Prozessen (AGI schreibt, Dashboard liest):
+# Unix-Datagram-Socket im abstrakten Namensraum, keine Datei noetig
+CHANGE_SOCKET = os.environ.get("KI_DB_CHANGE_SOCKET", "\0ki-telefonassistent-calls")
+
 
 def _connect():
     """Erstellt eine DB-Verbindung mit WAL-Modus fuer Concurrency."""
@@ -23,6 +28,53 @@ def _connect():
     return conn
 
 
+def get_data_version():
+    """
+    Aendert sich bei jedem Schreibzugriff, auch aus anderen Prozessen (AGI):
+    Aenderungszeit von Datenbank und WAL-Datei. Billiger als eine Abfrage.
+    None, solange die Datenbank noch nicht existiert.
+    """
+    try:
+        stat = DB_PATH.stat()
+    except FileNotFoundError:
+        return None
+    version = [(stat.st_mtime_ns, stat.st_size)]
+    try:
+        stat = DB_PATH.with_name(DB_PATH.name + "-wal").stat()
+        version.append((stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
+        version.append(None)
+    return tuple(version)
+
+
+def _notify_change():
+    """
+    Meldet eine Aenderung an den lauschenden Prozess (Web-Dashboard).
+    Lauscht niemand, passiert nichts - der Anruf darf daran nie scheitern.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            sock.sendto(b"1", CHANGE_SOCKET)
+    except OSError:
+        pass
+
+
+def open_change_listener():
+    """
+    Socket, der nach jeder Aenderung an Anrufen lesbar wird (aus jedem Prozess).
+    Gibt None zurueck, wenn bereits ein anderer Prozess lauscht.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.bind(CHANGE_SOCKET)
+    except OSError:
+        sock.close()
+        return None
+    sock.setblocking(False)
+    return sock
+
+
 def init_database():
     """Erstellt die Datenbank und Tabellen."""
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -97,6 +149,7 @@ def start_call(call_id, caller_number, business_type="handwerk"):
     )
     conn.commit()
     conn.close()
+    _notify_change()
     logger.info(f"Anruf gestartet: {call_id} von {caller_number}")
 
 
@@ -118,6 +171,7 @@ def end_call(call_id, recording_path=None):
     )
     conn.commit()
     conn.close()
+    _notify_change()
     logger.info(f"Anruf beendet: {call_id}")
 
 
@@ -155,6 +209,7 @@ def save_caller_info(call_id, info):
     )
     conn.commit()
     conn.close()
+    _notify_change()
     logger.info(f"Anrufer-Info gespeichert für {call_id}")
 
 
@@ -59,6 +59,9 @@ def load_config():
         "whisper_model": os.getenv("WHISPER_MODEL", "small"),
         "whisper_language": os.getenv("WHISPER_LANGUAGE", "de"),
         "whisper_device": os.getenv("WHISPER_DEVICE", "cpu"),
+        "whisper_vad_model": os.getenv("WHISPER_VAD_MODEL", ""),
+        "whisper_cpu_threads": int(os.getenv("WHISPER_CPU_THREADS", "0")),
+        "whisper_num_workers": int(os.getenv("WHISPER_NUM_WORKERS", "1")),
         # Allgemein
         "log_level": os.getenv("LOG_LEVEL", "INFO"),
         "recordings_dir": os.getenv("RECORDINGS_DIR", str(BASE_DIR / "recordings")),
@@ -7,11 +7,11 @@ SMS-Versand ueber sipgate API.
 
 import logging
 import smtplib
-import requests
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from src.config_loader import load_config
+from src.http_client import session
 from src.booking_database import get_business_by_id, get_or_create_customer_token
 
 logger = logging.getLogger(__name__)
@@ -364,7 +364,7 @@ class CustomerNotifier:
             return
 
         # sipgate SMS API
-        resp = requests.post(
+        resp = session.post(
             "https://api.sipgate.com/v2/sessions/sms",
             json={
                 "smsId": "s0",
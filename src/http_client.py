@@ -0,0 +1,21 @@
+"""
+Gemeinsamer HTTP-Client fuer ausgehende API-Aufrufe.
+Eine requests.Session pro Prozess haelt TCP/TLS-Verbindungen offen
+(LLM-APIs, Telegram, sipgate), statt bei jedem Aufruf neu zu verbinden.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_connections=10, pool_maxsize=10):
+    """Erstellt eine Session mit Connection-Pool (Keep-Alive)."""
+    new_session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    new_session.mount("https://", adapter)
+    new_session.mount("http://", adapter)
+    return new_session
+
+
+# Prozessweit geteilte Session
+session = create_session()
@@ -5,9 +5,16 @@ Unterstützt: Groq (kostenlos), OpenAI, Google Gemini, Anthropic, und Ollama (lo
 
 import logging
 import time
+import hashlib
+import functools
+import threading
 import requests
 import json
 import os
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from src.http_client import session
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +25,13 @@ FALLBACK_RESPONSE = (
     "Ihren Namen und Ihre Telefonnummer."
 )
 
+# Standard-Temperatur fuer Gespraechsantworten
+DEFAULT_TEMPERATURE = 0.7
+
+# Antworten mit Temperatur <= diesem Wert gelten als deterministisch und werden gecacht
+CACHE_MAX_TEMPERATURE = 0.1
+RESPONSE_CACHE_SIZE = 512
+
 EXTRACTION_PROMPT = """Extrahiere folgende Informationen aus dem Gespräch (falls vorhanden).
 Antworte NUR im JSON-Format:
 {
@@ -58,6 +72,104 @@ Regeln:
 - Datum: Versuche relative Angaben wie "naechsten Dienstag" oder "morgen" NICHT umzurechnen, schreibe sie woertlich wenn kein konkretes Datum genannt wurde
 - urgency "notfall" nur bei echten Notfaellen (Wasserrohrbruch, Gasgeruch etc.)"""
 
+# Laufende Anfragen (Key -> Future): identische parallele Anfragen teilen sich einen API-Call
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _request_key(engine, system_prompt, conversation_history, user_message, max_tokens,
+                 temperature):
+    """Stabiler Hash ueber alles, was die Antwort bestimmt."""
+    payload = json.dumps(
+        [type(engine).__name__, engine.model, system_prompt,
+         conversation_history, user_message, max_tokens, temperature],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _coalesce_inflight(generate):
+    """
+    Decorator fuer generate_response: Laeuft bereits eine identische Anfrage
+    (z.B. Begruessung oder "Bitte wiederholen Sie das?"), wartet der zweite
+    Aufrufer auf deren Ergebnis statt einen eigenen API-Call zu machen.
+    """
+    @functools.wraps(generate)
+    def wrapper(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                temperature=None):
+        key = _request_key(
+            self, system_prompt, conversation_history, user_message, max_tokens, temperature
+        )
+
+        with _INFLIGHT_LOCK:
+            future = _INFLIGHT.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                _INFLIGHT[key] = future
+
+        if not owner:
+            logger.debug("Identische LLM-Anfrage laeuft bereits - warte auf Ergebnis")
+            return dict(future.result())
+
+        try:
+            result = generate(
+                self, system_prompt, conversation_history, user_message, max_tokens, temperature
+            )
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+
+    return wrapper
+
+
+# LRU-Cache fuer deterministische Anfragen (z.B. Extraktion von Name/Anliegen)
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _cache_deterministic(generate):
+    """
+    Decorator fuer generate_response: Bei Temperatur <= CACHE_MAX_TEMPERATURE
+    wird die Antwort gecacht, ein Treffer braucht keinen API-Call.
+    Fehlerantworten werden nicht gecacht.
+    """
+    @functools.wraps(generate)
+    def wrapper(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                temperature=None):
+        if temperature is None or temperature > CACHE_MAX_TEMPERATURE:
+            return generate(
+                self, system_prompt, conversation_history, user_message, max_tokens, temperature
+            )
+
+        key = _request_key(
+            self, system_prompt, conversation_history, user_message, max_tokens, temperature
+        )
+        with _RESPONSE_CACHE_LOCK:
+            cached = _RESPONSE_CACHE.get(key)
+            if cached is not None:
+                _RESPONSE_CACHE.move_to_end(key)
+        if cached is not None:
+            logger.debug("LLM-Antwort aus Cache")
+            return dict(cached, processing_time=0, cached=True)
+
+        result = generate(
+            self, system_prompt, conversation_history, user_message, max_tokens, temperature
+        )
+        if not result.get("error"):
+            with _RESPONSE_CACHE_LOCK:
+                _RESPONSE_CACHE[key] = dict(result)
+                if len(_RESPONSE_CACHE) > RESPONSE_CACHE_SIZE:
+                    _RESPONSE_CACHE.popitem(last=False)
+        return result
+
+    return wrapper
+
 
 def create_llm_engine(config):
     """
@@ -81,7 +193,7 @@ def create_llm_engine(config):
             f"Verfügbar: {list(engines.keys())}"
         )
 
-    logger.info(f"LLM-Provider: {provider}")
+    logger.info("LLM-Provider: %s", provider)
 
     # Bei Groq: Automatisch Fallback zu Gemini einrichten (falls Gemini-Key vorhanden)
     if provider == "groq" and config.get("gemini_api_key"):
@@ -94,14 +206,45 @@ def create_llm_engine(config):
 class BaseLLMEngine:
     """Basis-Klasse für alle LLM-Engines."""
 
-    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None):
+    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                          temperature=None):
         raise NotImplementedError
 
+    def generate_response_stream(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        """
+        Liefert die Antwort stueckweise, sobald das LLM Tokens erzeugt.
+        So kann die TTS schon mit dem ersten Satz beginnen.
+        Bei Fehler vor dem ersten Token wird FALLBACK_RESPONSE geliefert.
+        """
+        start = time.time()
+        received = False
+        try:
+            for delta in self._stream_deltas(
+                system_prompt, conversation_history, user_message, max_tokens
+            ):
+                if delta:
+                    received = True
+                    yield delta
+        except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+            logger.error(f"{type(self).__name__}-Streaming-Fehler: {e}")
+            if not received:
+                yield FALLBACK_RESPONSE
+            return
+
+        logger.info("%s-Stream beendet (%.1fs)", type(self).__name__, time.time() - start)
+
+    def _stream_deltas(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        """Standard: kein natives Streaming, komplette Antwort als ein Stueck."""
+        result = self.generate_response(
+            system_prompt, conversation_history, user_message, max_tokens
+        )
+        yield result["response"]
+
     def extract_caller_info(self, conversation_text):
         """Extrahiert Anrufer-Informationen aus dem Gespräch."""
         try:
             result = self.generate_response(
-                EXTRACTION_PROMPT, [], conversation_text, max_tokens=500
+                EXTRACTION_PROMPT, [], conversation_text, max_tokens=500, temperature=0.0
             )
             content = result.get("response", "")
             start_idx = content.find("{")
@@ -122,7 +265,7 @@ class BaseLLMEngine:
         """Extrahiert strukturierte Booking-Daten aus dem Gespraech."""
         try:
             result = self.generate_response(
-                BOOKING_EXTRACTION_PROMPT, [], conversation_text, max_tokens=500
+                BOOKING_EXTRACTION_PROMPT, [], conversation_text, max_tokens=500, temperature=0.0
             )
             content = result.get("response", "")
             start_idx = content.find("{")
@@ -130,8 +273,8 @@ class BaseLLMEngine:
             if start_idx >= 0 and end_idx > start_idx:
                 json_str = content[start_idx:end_idx]
                 data = json.loads(json_str)
-                logger.info(f"Booking-Daten extrahiert: type={data.get('booking_type')}, "
-                            f"has_request={data.get('has_booking_request')}")
+                logger.info("Booking-Daten extrahiert: type=%s, has_request=%s",
+                            data.get("booking_type"), data.get("has_booking_request"))
                 return data
         except (json.JSONDecodeError, Exception) as e:
             logger.warning(f"Konnte Booking-Daten nicht extrahieren: {e}")
@@ -159,6 +302,17 @@ class BaseLLMEngine:
         messages.append({"role": "user", "content": user_message})
         return messages
 
+    def _iter_sse_data(self, resp):
+        """Liest die 'data:'-Zeilen eines Server-Sent-Events-Streams als JSON."""
+        for line in resp.iter_lines():
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                break
+            if data:
+                yield json.loads(data)
+
     def _error_response(self, error_msg):
         return {
             "response": FALLBACK_RESPONSE,
@@ -191,9 +345,9 @@ class FallbackEngine(BaseLLMEngine):
         self._groq_fallback_model = "llama-3.1-8b-instant"  # Kleineres Modell = hoeheres Rate-Limit
         self._gemini_available = bool(config.get("gemini_api_key"))
 
-        logger.info(f"FallbackEngine: Primary=Groq ({self.primary.model}), "
-                    f"Fallback1=Groq ({self._groq_fallback_model}), "
-                    f"Fallback2={'Gemini' if self._gemini_available else 'None'}")
+        logger.info("FallbackEngine: Primary=Groq (%s), Fallback1=Groq (%s), Fallback2=%s",
+                    self.primary.model, self._groq_fallback_model,
+                    "Gemini" if self._gemini_available else "None")
 
     def _get_groq_fallback(self):
         """Erstellt eine Groq-Engine mit kleinerem Modell."""
@@ -202,7 +356,7 @@ class FallbackEngine(BaseLLMEngine):
                 fallback_config = dict(self.config)
                 fallback_config["groq_model"] = self._groq_fallback_model
                 self.fallback_groq = GroqEngine(fallback_config)
-                logger.info(f"Groq-Fallback initialisiert: {self._groq_fallback_model}")
+                logger.info("Groq-Fallback initialisiert: %s", self._groq_fallback_model)
             except Exception as e:
                 logger.error(f"Groq-Fallback konnte nicht initialisiert werden: {e}")
         return self.fallback_groq
@@ -218,48 +372,86 @@ class FallbackEngine(BaseLLMEngine):
                 self._gemini_available = False
         return self.fallback_gemini
 
-    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None):
+    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                          temperature=None):
         # Versuche zuerst Primary (Groq mit grossem Modell)
         result = self.primary.generate_response(
-            system_prompt, conversation_history, user_message, max_tokens
+            system_prompt, conversation_history, user_message, max_tokens, temperature
         )
 
         # Bei Fehler (Rate-Limit, Timeout, etc.): Fallbacks versuchen
         if result.get("error"):
             error_msg = result.get("error", "")
             logger.warning(f"Primary LLM (Groq {self.primary.model}) fehlgeschlagen: {error_msg}")
-
-            # Rate-Limit -> Fallbacks versuchen
-            if "429" in error_msg or "rate" in error_msg.lower() or "timeout" in error_msg.lower():
-
-                # Fallback 1: Groq mit kleinerem Modell (hoeheres Rate-Limit)
-                groq_fallback = self._get_groq_fallback()
-                if groq_fallback:
-                    logger.info(f"Wechsle zu Groq-Fallback ({self._groq_fallback_model})...")
-                    fallback_result = groq_fallback.generate_response(
-                        system_prompt, conversation_history, user_message, max_tokens
-                    )
-                    if not fallback_result.get("error"):
-                        fallback_result["fallback_used"] = "groq_small"
-                        self.model = groq_fallback.model
-                        return fallback_result
-                    logger.warning(f"Groq-Fallback auch fehlgeschlagen: {fallback_result.get('error')}")
-
-                # Fallback 2: Gemini
-                gemini_fallback = self._get_gemini_fallback()
-                if gemini_fallback:
-                    logger.info("Wechsle zu Gemini-Fallback...")
-                    fallback_result = gemini_fallback.generate_response(
-                        system_prompt, conversation_history, user_message, max_tokens
-                    )
-                    if not fallback_result.get("error"):
-                        fallback_result["fallback_used"] = "gemini"
-                        self.model = gemini_fallback.model
-                        return fallback_result
-                    logger.error(f"Gemini-Fallback auch fehlgeschlagen: {fallback_result.get('error')}")
+            fallback_result = self._try_fallbacks(
+                error_msg, system_prompt, conversation_history, user_message, max_tokens,
+                temperature,
+            )
+            if fallback_result:
+                return fallback_result
 
         return result
 
+    def generate_response_stream(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        # Primary streamen; Fallbacks nur, wenn noch kein Token angekommen ist
+        received = False
+        try:
+            for delta in self.primary._stream_deltas(
+                system_prompt, conversation_history, user_message, max_tokens
+            ):
+                if delta:
+                    received = True
+                    yield delta
+            return
+        except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+            if received:
+                logger.error(f"Groq-Stream abgebrochen: {e}")
+                return
+            error_msg = str(e)
+            if isinstance(e, requests.Timeout):
+                error_msg = "timeout"
+            logger.warning(f"Primary LLM (Groq {self.primary.model}) fehlgeschlagen: {error_msg}")
+
+        fallback_result = self._try_fallbacks(
+            error_msg, system_prompt, conversation_history, user_message, max_tokens
+        )
+        yield fallback_result["response"] if fallback_result else FALLBACK_RESPONSE
+
+    def _try_fallbacks(self, error_msg, system_prompt, conversation_history, user_message, max_tokens,
+                       temperature=None):
+        """Versucht die Fallback-Engines. Gibt None zurueck wenn keiner greift."""
+        # Nur bei Rate-Limit/Timeout -> Fallbacks versuchen
+        if not ("429" in error_msg or "rate" in error_msg.lower() or "timeout" in error_msg.lower()):
+            return None
+
+        # Fallback 1: Groq mit kleinerem Modell (hoeheres Rate-Limit)
+        groq_fallback = self._get_groq_fallback()
+        if groq_fallback:
+            logger.info("Wechsle zu Groq-Fallback (%s)...", self._groq_fallback_model)
+            fallback_result = groq_fallback.generate_response(
+                system_prompt, conversation_history, user_message, max_tokens, temperature
+            )
+            if not fallback_result.get("error"):
+                fallback_result["fallback_used"] = "groq_small"
+                self.model = groq_fallback.model
+                return fallback_result
+            logger.warning(f"Groq-Fallback auch fehlgeschlagen: {fallback_result.get('error')}")
+
+        # Fallback 2: Gemini
+        gemini_fallback = self._get_gemini_fallback()
+        if gemini_fallback:
+            logger.info("Wechsle zu Gemini-Fallback...")
+            fallback_result = gemini_fallback.generate_response(
+                system_prompt, conversation_history, user_message, max_tokens, temperature
+            )
+            if not fallback_result.get("error"):
+                fallback_result["fallback_used"] = "gemini"
+                self.model = gemini_fallback.model
+                return fallback_result
+            logger.error(f"Gemini-Fallback auch fehlgeschlagen: {fallback_result.get('error')}")
+
+        return None
+
 
 # ============================================================
 # GROQ - Kostenlos, sehr schnell (empfohlen)
@@ -275,6 +467,10 @@ class GroqEngine(BaseLLMEngine):
         self.api_key = config.get("groq_api_key", "")
         self.model = config.get("groq_model", "llama-3.1-8b-instant")
         self.api_url = "https://api.groq.com/openai/v1/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
 
         if not self.api_key:
             raise ValueError(
@@ -285,33 +481,34 @@ class GroqEngine(BaseLLMEngine):
 
     def _check_connection(self):
         try:
-            resp = requests.get(
+            resp = session.get(
                 "https://api.groq.com/openai/v1/models",
-                headers={"Authorization": f"Bearer {self.api_key}"},
+                headers=self._headers,
                 timeout=5,
             )
             resp.raise_for_status()
-            logger.info(f"Groq verbunden. Modell: {self.model}")
+            logger.info("Groq verbunden. Modell: %s", self.model)
         except requests.RequestException as e:
             logger.error(f"Groq nicht erreichbar: {e}")
             raise
 
-    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None):
+    @_cache_deterministic
+    @_coalesce_inflight
+    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                          temperature=None):
         messages = self._build_messages(system_prompt, conversation_history, user_message)
-        logger.debug(f"Groq-Anfrage: {user_message[:100]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Groq-Anfrage: %s", user_message[:100])
         start = time.time()
 
         try:
-            resp = requests.post(
+            resp = session.post(
                 self.api_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
+                headers=self._headers,
                 json={
                     "model": self.model,
                     "messages": messages,
-                    "temperature": 0.7,
+                    "temperature": DEFAULT_TEMPERATURE if temperature is None else temperature,
                     "max_tokens": max_tokens or 250,
                     "top_p": 0.9,
                 },
@@ -324,7 +521,7 @@ class GroqEngine(BaseLLMEngine):
             duration = time.time() - start
             tokens = result.get("usage", {}).get("total_tokens", 0)
 
-            logger.info(f"Groq-Antwort ({duration:.1f}s, {tokens} Tokens): '{response_text[:100]}'")
+            logger.info("Groq-Antwort (%.1fs, %d Tokens): '%.100s'", duration, tokens, response_text)
 
             return {
                 "response": response_text,
@@ -340,6 +537,26 @@ class GroqEngine(BaseLLMEngine):
             return self._error_response(str(e))
 
 
+    def _stream_deltas(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        messages = self._build_messages(system_prompt, conversation_history, user_message)
+        with session.post(
+            self.api_url,
+            headers=self._headers,
+            json={
+                "model": self.model,
+                "messages": messages,
+                "temperature": DEFAULT_TEMPERATURE,
+                "max_tokens": max_tokens or 250,
+                "top_p": 0.9,
+                "stream": True,
+            },
+            stream=True,
+            timeout=15,
+        ) as resp:
+            resp.raise_for_status()
+            for event in self._iter_sse_data(resp):
+                yield event["choices"][0]["delta"].get("content") or ""
+
 # ============================================================
 # OPENAI - GPT-4o-mini (sehr günstig, hohe Qualität)
 # ============================================================
@@ -353,6 +570,10 @@ class OpenAIEngine(BaseLLMEngine):
         self.api_key = config.get("openai_api_key", "")
         self.model = config.get("openai_model", "gpt-4o-mini")
         self.api_url = "https://api.openai.com/v1/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
 
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY nicht gesetzt.")
@@ -360,32 +581,32 @@ class OpenAIEngine(BaseLLMEngine):
 
     def _check_connection(self):
         try:
-            resp = requests.get(
+            resp = session.get(
                 "https://api.openai.com/v1/models",
-                headers={"Authorization": f"Bearer {self.api_key}"},
+                headers=self._headers,
                 timeout=5,
             )
             resp.raise_for_status()
-            logger.info(f"OpenAI verbunden. Modell: {self.model}")
+            logger.info("OpenAI verbunden. Modell: %s", self.model)
         except requests.RequestException as e:
             logger.error(f"OpenAI nicht erreichbar: {e}")
             raise
 
-    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None):
+    @_cache_deterministic
+    @_coalesce_inflight
+    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                          temperature=None):
         messages = self._build_messages(system_prompt, conversation_history, user_message)
         start = time.time()
 
         try:
-            resp = requests.post(
+            resp = session.post(
                 self.api_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
+                headers=self._headers,
                 json={
                     "model": self.model,
                     "messages": messages,
-                    "temperature": 0.7,
+                    "temperature": DEFAULT_TEMPERATURE if temperature is None else temperature,
                     "max_tokens": max_tokens or 250,
                 },
                 timeout=15,
@@ -397,7 +618,7 @@ class OpenAIEngine(BaseLLMEngine):
             duration = time.time() - start
             tokens = result.get("usage", {}).get("total_tokens", 0)
 
-            logger.info(f"OpenAI-Antwort ({duration:.1f}s): '{response_text[:100]}'")
+            logger.info("OpenAI-Antwort (%.1fs): '%.100s'", duration, response_text)
 
             return {
                 "response": response_text,
@@ -412,6 +633,26 @@ class OpenAIEngine(BaseLLMEngine):
             return self._error_response(str(e))
 
 
+    def _stream_deltas(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        messages = self._build_messages(system_prompt, conversation_history, user_message)
+        with session.post(
+            self.api_url,
+            headers=self._headers,
+            json={
+                "model": self.model,
+                "messages": messages,
+                "temperature": DEFAULT_TEMPERATURE,
+                "max_tokens": max_tokens or 250,
+                "stream": True,
+            },
+            stream=True,
+            timeout=15,
+        ) as resp:
+            resp.raise_for_status()
+            for event in self._iter_sse_data(resp):
+                choices = event.get("choices") or [{}]
+                yield choices[0].get("delta", {}).get("content") or ""
+
 # ============================================================
 # GOOGLE GEMINI - Kostenloser Tier, gute Qualität
 # ============================================================
@@ -428,37 +669,54 @@ class GeminiEngine(BaseLLMEngine):
             f"https://generativelanguage.googleapis.com/v1beta/"
             f"models/{self.model}:generateContent"
         )
+        self.stream_url = (
+            f"https://generativelanguage.googleapis.com/v1beta/"
+            f"models/{self.model}:streamGenerateContent"
+        )
+        self._url_with_key = f"{self.api_url}?key={self.api_key}"
+        self._stream_url_with_key = f"{self.stream_url}?alt=sse&key={self.api_key}"
+        self._headers = {"Content-Type": "application/json"}
 
         if not self.api_key:
             raise ValueError(
                 "GEMINI_API_KEY nicht gesetzt. "
                 "Kostenlos: https://aistudio.google.com/app/apikey"
             )
-        logger.info(f"Gemini konfiguriert. Modell: {self.model}")
-
-    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None):
-        start = time.time()
+        logger.info("Gemini konfiguriert. Modell: %s", self.model)
 
-        # Gemini-Format: system_instruction + contents
+    def _build_payload(self, system_prompt, conversation_history, user_message, max_tokens,
+                       temperature=None):
+        """Gemini-Format: system_instruction + contents."""
         contents = []
         for msg in conversation_history:
             role = "user" if msg["role"] == "user" else "model"
             contents.append({"role": role, "parts": [{"text": msg["content"]}]})
         contents.append({"role": "user", "parts": [{"text": user_message}]})
 
+        return {
+            "system_instruction": {"parts": [{"text": system_prompt}]},
+            "contents": contents,
+            "generationConfig": {
+                "temperature": DEFAULT_TEMPERATURE if temperature is None else temperature,
+                "maxOutputTokens": max_tokens or 150,
+                "topP": 0.9,
+            },
+        }
+
+    @_cache_deterministic
+    @_coalesce_inflight
+    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                          temperature=None):
+        start = time.time()
+        payload = self._build_payload(
+            system_prompt, conversation_history, user_message, max_tokens, temperature
+        )
+
         try:
-            resp = requests.post(
-                f"{self.api_url}?key={self.api_key}",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "system_instruction": {"parts": [{"text": system_prompt}]},
-                    "contents": contents,
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "maxOutputTokens": max_tokens or 150,
-                        "topP": 0.9,
-                    },
-                },
+            resp = session.post(
+                self._url_with_key,
+                headers=self._headers,
+                json=payload,
                 timeout=15,
             )
             resp.raise_for_status()
@@ -470,7 +728,7 @@ class GeminiEngine(BaseLLMEngine):
             duration = time.time() - start
             tokens = result.get("usageMetadata", {}).get("totalTokenCount", 0)
 
-            logger.info(f"Gemini-Antwort ({duration:.1f}s): '{response_text[:100]}'")
+            logger.info("Gemini-Antwort (%.1fs): '%.100s'", duration, response_text)
 
             return {
                 "response": response_text,
@@ -485,6 +743,21 @@ class GeminiEngine(BaseLLMEngine):
             return self._error_response(str(e))
 
 
+    def _stream_deltas(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        payload = self._build_payload(system_prompt, conversation_history, user_message, max_tokens)
+        with session.post(
+            self._stream_url_with_key,
+            headers=self._headers,
+            json=payload,
+            stream=True,
+            timeout=15,
+        ) as resp:
+            resp.raise_for_status()
+            for event in self._iter_sse_data(resp):
+                for candidate in event.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        yield part.get("text", "")
+
 # ============================================================
 # ANTHROPIC - Claude (hochwertigste Antworten)
 # ============================================================
@@ -497,33 +770,40 @@ class AnthropicEngine(BaseLLMEngine):
         self.api_key = config.get("anthropic_api_key", "")
         self.model = config.get("anthropic_model", "claude-haiku-4-20250414")
         self.api_url = "https://api.anthropic.com/v1/messages"
+        self._headers = {
+            "x-api-key": self.api_key,
+            "content-type": "application/json",
+            "anthropic-version": "2023-06-01",
+        }
 
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY nicht gesetzt.")
-        logger.info(f"Anthropic konfiguriert. Modell: {self.model}")
+        logger.info("Anthropic konfiguriert. Modell: %s", self.model)
 
-    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None):
+    def _build_anthropic_messages(self, conversation_history, user_message):
         messages = []
         for msg in conversation_history:
             messages.append({"role": msg["role"], "content": msg["content"]})
         messages.append({"role": "user", "content": user_message})
+        return messages
 
+    @_cache_deterministic
+    @_coalesce_inflight
+    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                          temperature=None):
+        messages = self._build_anthropic_messages(conversation_history, user_message)
         start = time.time()
 
         try:
-            resp = requests.post(
+            resp = session.post(
                 self.api_url,
-                headers={
-                    "x-api-key": self.api_key,
-                    "content-type": "application/json",
-                    "anthropic-version": "2023-06-01",
-                },
+                headers=self._headers,
                 json={
                     "model": self.model,
                     "system": system_prompt,
                     "messages": messages,
                     "max_tokens": max_tokens or 250,
-                    "temperature": 0.7,
+                    "temperature": DEFAULT_TEMPERATURE if temperature is None else temperature,
                 },
                 timeout=15,
             )
@@ -535,7 +815,7 @@ class AnthropicEngine(BaseLLMEngine):
             tokens = result.get("usage", {}).get("input_tokens", 0) + \
                      result.get("usage", {}).get("output_tokens", 0)
 
-            logger.info(f"Anthropic-Antwort ({duration:.1f}s): '{response_text[:100]}'")
+            logger.info("Anthropic-Antwort (%.1fs): '%.100s'", duration, response_text)
 
             return {
                 "response": response_text,
@@ -550,6 +830,29 @@ class AnthropicEngine(BaseLLMEngine):
             return self._error_response(str(e))
 
 
+    def _stream_deltas(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        messages = self._build_anthropic_messages(conversation_history, user_message)
+        with session.post(
+            self.api_url,
+            headers=self._headers,
+            json={
+                "model": self.model,
+                "system": system_prompt,
+                "messages": messages,
+                "max_tokens": max_tokens or 250,
+                "temperature": DEFAULT_TEMPERATURE,
+                "stream": True,
+            },
+            stream=True,
+            timeout=15,
+        ) as resp:
+            resp.raise_for_status()
+            for event in self._iter_sse_data(resp):
+                if event.get("type") == "content_block_delta":
+                    yield event.get("delta", {}).get("text", "")
+                elif event.get("type") == "error":
+                    raise ValueError(event.get("error", {}).get("message", "Stream-Fehler"))
+
 # ============================================================
 # OLLAMA - Lokal (kein Internet nötig, aber braucht starke Hardware)
 # ============================================================
@@ -564,26 +867,29 @@ class OllamaEngine(BaseLLMEngine):
 
     def _check_connection(self):
         try:
-            resp = requests.get(f"{self.host}/api/tags", timeout=5)
+            resp = session.get(f"{self.host}/api/tags", timeout=5)
             resp.raise_for_status()
-            logger.info(f"Ollama verbunden. Modell: {self.model}")
+            logger.info("Ollama verbunden. Modell: %s", self.model)
         except requests.ConnectionError:
             logger.error(f"Ollama nicht erreichbar unter {self.host}")
             raise
 
-    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None):
+    @_cache_deterministic
+    @_coalesce_inflight
+    def generate_response(self, system_prompt, conversation_history, user_message, max_tokens=None,
+                          temperature=None):
         messages = self._build_messages(system_prompt, conversation_history, user_message)
         start = time.time()
 
         try:
-            resp = requests.post(
+            resp = session.post(
                 self.api_url,
                 json={
                     "model": self.model,
                     "messages": messages,
                     "stream": False,
                     "options": {
-                        "temperature": 0.7,
+                        "temperature": DEFAULT_TEMPERATURE if temperature is None else temperature,
                         "top_p": 0.9,
                         "num_predict": max_tokens or 150,
                     },
@@ -596,7 +902,7 @@ class OllamaEngine(BaseLLMEngine):
             response_text = result.get("message", {}).get("content", "").strip()
             duration = time.time() - start
 
-            logger.info(f"Ollama-Antwort ({duration:.1f}s): '{response_text[:100]}'")
+            logger.info("Ollama-Antwort (%.1fs): '%.100s'", duration, response_text)
 
             return {
                 "response": response_text,
@@ -609,3 +915,30 @@ class OllamaEngine(BaseLLMEngine):
         except requests.RequestException as e:
             logger.error(f"Ollama-Fehler: {e}")
             return self._error_response(str(e))
+
+    def _stream_deltas(self, system_prompt, conversation_history, user_message, max_tokens=None):
+        messages = self._build_messages(system_prompt, conversation_history, user_message)
+        with session.post(
+            self.api_url,
+            json={
+                "model": self.model,
+                "messages": messages,
+                "stream": True,
+                "options": {
+                    "temperature": DEFAULT_TEMPERATURE,
+                    "top_p": 0.9,
+                    "num_predict": max_tokens or 150,
+                },
+            },
+            stream=True,
+            timeout=30,
+        ) as resp:
+            resp.raise_for_status()
+            # Ollama streamt zeilenweise JSON (kein SSE)
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                yield chunk.get("message", {}).get("content", "")
+                if chunk.get("done"):
+                    break
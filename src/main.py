@@ -7,7 +7,6 @@ Startet alle Dienste und initialisiert das System.
 import sys
 import logging
 import signal
-import time
 from pathlib import Path
 
 # Pfad zum Projekt
@@ -70,6 +69,9 @@ def verify_system(config, logger):
             model_size=config["whisper_model"],
             device=config["whisper_device"],
             language=config["whisper_language"],
+            vad_model_path=config["whisper_vad_model"],
+            cpu_threads=config["whisper_cpu_threads"],
+            num_workers=config["whisper_num_workers"],
         )
         logger.info(f"[OK] Whisper STT geladen (Modell: {config['whisper_model']})")
         checks.append(True)
@@ -137,13 +139,13 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    # Hauptschleife - wartet auf Asterisk AGI-Aufrufe
+    # Hauptprozess schläft im Kernel bis ein Signal eintrifft
     # (Die eigentliche Arbeit passiert im agi_handler.py,
-    #  der von Asterisk bei jedem Anruf gestartet wird)
+    #  der von Asterisk bei jedem Anruf gestartet wird.
+    #  Periodische Health-Checks könnten per signal.setitimer laufen)
     try:
         while True:
-            time.sleep(60)
-            # Periodische Health-Checks könnten hier laufen
+            signal.pause()
     except KeyboardInterrupt:
         logger.info("Beendet durch Benutzer.")
 
@@ -3,15 +3,45 @@ Benachrichtigungssystem für den KI-Telefonassistenten.
 Sendet Anruf-Zusammenfassungen per E-Mail und/oder Telegram.
 """
 
+import atexit
 import logging
+import queue
 import smtplib
+import threading
+import time
 import requests
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 
+from src.http_client import session
+
 logger = logging.getLogger(__name__)
 
+# HTML-Rahmen der E-Mail (der <pre>-Block erhaelt die Zeilenumbrueche)
+_EMAIL_TEMPLATE = """
+        <html>
+        <body style="font-family: -apple-system, Arial, sans-serif;
+                     background: #f5f5f5; padding: 20px;">
+            <div style="max-width: 500px; margin: 0 auto; background: white;
+                        border-radius: 12px; padding: 25px;
+                        box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
+                <h2 style="color: #1a1a2e; border-bottom: 2px solid #e94560;
+                           padding-bottom: 10px;">
+                    KI-Telefonassistent
+                </h2>
+                <pre style="font-family: -apple-system, Arial, sans-serif;
+                            font-size: 14px; line-height: 1.8; color: #333;">
+{body}
+                </pre>
+            </div>
+        </body>
+        </html>
+        """
+
+# Dicke Trennlinien in HTML durch duenne ersetzen
+_EMAIL_TRANS = str.maketrans({"━": "─"})
+
 
 class NotificationManager:
     """Verwaltet alle Benachrichtigungskanäle."""
@@ -36,6 +66,16 @@ class NotificationManager:
                 "Anruf-Infos sind nur im Dashboard sichtbar."
             )
 
+        # Versand läuft im Hintergrund, damit ein langsamer SMTP-Server oder
+        # Telegram den AGI-Handler nicht blockiert
+        self._queue = queue.Queue(maxsize=200)
+        self._worker = threading.Thread(
+            target=self._run_worker, name="notifications", daemon=True
+        )
+        self._worker.start()
+        # Beim Prozessende ausstehende Benachrichtigungen noch zustellen
+        atexit.register(self.close)
+
     def notify_new_call(self, caller_info, call_data):
         """
         Benachrichtigt über einen neuen Anruf.
@@ -47,11 +87,34 @@ class NotificationManager:
         message = self._format_message(caller_info, call_data)
         subject = self._format_subject(caller_info)
 
-        for channel in self.channels:
-            try:
-                channel.send(subject, message)
-            except Exception as e:
-                logger.error(f"Benachrichtigung fehlgeschlagen ({channel.name}): {e}")
+        try:
+            self._queue.put_nowait((subject, message))
+        except queue.Full:
+            logger.error("Benachrichtigungs-Warteschlange voll - Nachricht verworfen")
+
+    def _run_worker(self):
+        """Arbeitet die Warteschlange ab (ein Hintergrund-Thread pro Manager)."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            subject, message = item
+            for channel in self.channels:
+                try:
+                    channel.send(subject, message)
+                except Exception as e:
+                    logger.error(f"Benachrichtigung fehlgeschlagen ({channel.name}): {e}")
+
+    def close(self, timeout=30):
+        """Stellt ausstehende Benachrichtigungen zu und beendet den Worker."""
+        if not self._worker.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Benachrichtigungs-Worker reagiert nicht")
+            return
+        self._worker.join(timeout)
 
     def _format_subject(self, caller_info):
         """Erstellt den Betreff / Titel."""
@@ -126,6 +189,45 @@ class EmailNotifier:
             for addr in config.get("email_to", "").split(",")
             if addr.strip()
         ]
+        # Offene SMTP-Verbindung wird wiederverwendet (spart TLS-Handshake + Login)
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _get_connection(self):
+        """Gibt eine funktionierende SMTP-Verbindung zurueck (NOOP-Check, sonst neu verbinden)."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard_connection()
+
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
+        try:
+            server.starttls()
+            server.login(self.smtp_user, self.smtp_pass)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+
+    def _discard_connection(self):
+        """Verwirft die aktuelle Verbindung ohne Fehler zu werfen."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+    def close(self):
+        """Schliesst die SMTP-Verbindung."""
+        with self._smtp_lock:
+            self._discard_connection()
 
     def send(self, subject, message):
         """Sendet eine E-Mail."""
@@ -144,41 +246,24 @@ class EmailNotifier:
         msg.attach(MIMEText(html_body, "html", "utf-8"))
 
         try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_pass)
-                server.send_message(msg)
+            with self._smtp_lock:
+                try:
+                    self._get_connection().send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # Server hat die Verbindung zwischen NOOP und Senden getrennt
+                    self._discard_connection()
+                    self._get_connection().send_message(msg)
 
             logger.info(f"E-Mail gesendet an: {', '.join(self.to_addrs)}")
-        except smtplib.SMTPException as e:
+        except (smtplib.SMTPException, OSError) as e:
             logger.error(f"E-Mail-Versand fehlgeschlagen: {e}")
+            with self._smtp_lock:
+                self._discard_connection()
             raise
 
     def _text_to_html(self, text):
         """Wandelt die Text-Nachricht in HTML um."""
-        # Einfache Konvertierung
-        html_text = text.replace("\n", "<br>")
-        html_text = html_text.replace("━", "─")
-
-        return f"""
-        <html>
-        <body style="font-family: -apple-system, Arial, sans-serif;
-                     background: #f5f5f5; padding: 20px;">
-            <div style="max-width: 500px; margin: 0 auto; background: white;
-                        border-radius: 12px; padding: 25px;
-                        box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                <h2 style="color: #1a1a2e; border-bottom: 2px solid #e94560;
-                           padding-bottom: 10px;">
-                    KI-Telefonassistent
-                </h2>
-                <pre style="font-family: -apple-system, Arial, sans-serif;
-                            font-size: 14px; line-height: 1.8; color: #333;">
-{text}
-                </pre>
-            </div>
-        </body>
-        </html>
-        """
+        return _EMAIL_TEMPLATE.format(body=text.translate(_EMAIL_TRANS))
 
 
 # ============================================================
@@ -197,6 +282,19 @@ class TelegramNotifier:
             if cid.strip()
         ]
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
+    def _send_to_chat(self, chat_id, telegram_text):
+        """Sendet die Nachricht an einen einzelnen Chat."""
+        resp = session.post(
+            f"{self.api_url}/sendMessage",
+            json={
+                "chat_id": chat_id,
+                "text": telegram_text,
+                "parse_mode": "Markdown",
+            },
+            timeout=10,
+        )
+        resp.raise_for_status()
+        logger.info(f"Telegram gesendet an Chat: {chat_id}")
 
     def send(self, subject, message):
         """Sendet eine Telegram-Nachricht."""
@@ -207,22 +305,53 @@ class TelegramNotifier:
         # Telegram-formatierte Nachricht
         telegram_text = f"*{subject}*\n\n{message}"
 
-        for chat_id in self.chat_ids:
+        if len(self.chat_ids) == 1:
             try:
-                resp = requests.post(
-                    f"{self.api_url}/sendMessage",
-                    json={
-                        "chat_id": chat_id,
-                        "text": telegram_text,
-                        "parse_mode": "Markdown",
-                    },
-                    timeout=10,
-                )
-                resp.raise_for_status()
-                logger.info(f"Telegram gesendet an Chat: {chat_id}")
+                self._send_to_chat(self.chat_ids[0], telegram_text)
             except requests.RequestException as e:
-                logger.error(f"Telegram-Fehler für Chat {chat_id}: {e}")
+                logger.error(f"Telegram-Fehler für Chat {self.chat_ids[0]}: {e}")
                 raise
+            return
+
+        # Mehrere Chats parallel beliefern (Gesamtdauer ~1 RTT statt N RTT).
+        # Eigene Threads statt ThreadPoolExecutor: der Versand laeuft oft erst
+        # im atexit-Drain, dann nimmt concurrent.futures keine Jobs mehr an.
+        errors = {}
+
+        def deliver(chat_id):
+            try:
+                self._send_to_chat(chat_id, telegram_text)
+            except Exception as e:
+                errors[chat_id] = e
+
+        threads = []
+        for chat_id in self.chat_ids:
+            thread = threading.Thread(target=deliver, args=(chat_id,), daemon=True)
+            try:
+                thread.start()
+            except RuntimeError:
+                # Interpreter faehrt herunter - keine neuen Threads, direkt senden
+                deliver(chat_id)
+                continue
+            threads.append((chat_id, thread))
+
+        deadline = time.monotonic() + 15
+        failed = []
+        for chat_id, thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logger.error(f"Telegram-Timeout für Chat {chat_id}")
+                failed.append(chat_id)
+        for chat_id, error in list(errors.items()):
+            if chat_id not in failed:
+                logger.error(f"Telegram-Fehler für Chat {chat_id}: {error}")
+                failed.append(chat_id)
+
+        if failed:
+            raise requests.RequestException(
+                f"Telegram-Versand fehlgeschlagen für {len(failed)}/{len(self.chat_ids)} Chats: "
+                f"{', '.join(failed)}"
+            )
 
     def get_chat_id_helper(self):
         """
@@ -231,7 +360,7 @@ class TelegramNotifier:
         dann diese Funktion aufrufen.
         """
         try:
-            resp = requests.get(f"{self.api_url}/getUpdates", timeout=10)
+            resp = session.get(f"{self.api_url}/getUpdates", timeout=10)
             resp.raise_for_status()
             updates = resp.json().get("result", [])
 
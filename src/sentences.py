@@ -0,0 +1,85 @@
+"""
+Satzerkennung fuer die Sprachausgabe.
+Wird vom LLM-Streaming (Satz fuer Satz sprechen) und von der TTS
+(lange Texte satzweise erzeugen) gemeinsam genutzt.
+"""
+
+import re
+
+# Satzende: Punkt/Frage-/Ausrufezeichen gefolgt von Leerraum
+_SENTENCE_BOUNDARY = re.compile(r"([.!?])\s+")
+
+# Abkuerzungen mit Punkt und ihre gesprochene Form. Gemeinsame Quelle fuer die
+# Satzerkennung (Punkt ist hier kein Satzende) und die TTS-Textbereinigung.
+# None = nicht ausschreiben (mehrdeutig, z.B. "Fr." = Frau/Freitag)
+ABBREVIATIONS = {
+    "z.B.": "zum Beispiel",
+    "z. B.": "zum Beispiel",
+    "d.h.": "das heisst",
+    "d. h.": "das heisst",
+    "u.a.": "unter anderem",
+    "u. a.": "unter anderem",
+    "ca.": "circa",
+    "bzgl.": "bezueglich",
+    "bzw.": "beziehungsweise",
+    "inkl.": "inklusive",
+    "zzgl.": "zuzueglich",
+    "usw.": "und so weiter",
+    "evtl.": "eventuell",
+    "ggf.": "gegebenenfalls",
+    "MwSt.": "Mehrwertsteuer",
+    "Tel.": "Telefon",
+    "Nr.": "Nummer",
+    "Str.": "Strasse",
+    "Dr.": "Doktor",
+    "Prof.": "Professor",
+    "Hr.": "Herr",
+    "Fr.": None,
+    "St.": None,
+    "Mo.": None,
+    "Di.": None,
+    "Mi.": None,
+    "Do.": None,
+    "Sa.": None,
+    "So.": None,
+}
+
+# Einzelwoerter aus ABBREVIATIONS, nach denen ein Punkt KEIN Satzende ist.
+# Gross geschriebene nur exakt ("So." ja, "Ach so." bleibt ein Satzende)
+_NO_SENTENCE_END = frozenset(
+    abbrev[:-1] for abbrev in ABBREVIATIONS
+    if abbrev.endswith(".") and abbrev[:-1].isalpha()
+)
+
+
+def _is_sentence_end(text):
+    """Prueft ob der Punkt am Ende von text ein Satzende ist (keine Zahl/Abkuerzung)."""
+    words = text.split()
+    if not words:
+        return False
+    word = words[-1].strip("\"'(")
+    if word in _NO_SENTENCE_END or word.lower() in _NO_SENTENCE_END:
+        return False
+    return len(word) >= 2 and word.isalpha()
+
+
+def iter_sentences(deltas):
+    """
+    Fasst gestreamte Text-Stuecke zu ganzen Saetzen zusammen.
+    Damit kann die TTS den ersten Satz sprechen, waehrend das LLM noch schreibt.
+    """
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        start = 0
+        for match in _SENTENCE_BOUNDARY.finditer(buffer):
+            if match.group(1) == "." and not _is_sentence_end(buffer[start:match.start()]):
+                continue
+            sentence = buffer[start:match.end()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+
+    if buffer.strip():
+        yield buffer.strip()
@@ -6,21 +6,291 @@ Subprozesse werden mit subprocess.Popen + start_new_session + close_fds
 gestartet, damit sie komplett isoliert von AGIs stdin/stdout sind.
 """
 
+import atexit
+import hashlib
+import json
 import logging
+import math
 import os
+import re
+import select
+import shutil
 import struct
 import subprocess
 import tempfile
+import threading
 import time
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 try:
     import requests
+    from src.http_client import create_session
 except ImportError:
     requests = None
 
+from src.sentences import ABBREVIATIONS, iter_sentences
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:
+    resample_poly = None
+
 logger = logging.getLogger(__name__)
 
+# --- Textbereinigung fuer die Sprachausgabe (einmalig kompiliert) ---
+_RE_STARS = re.compile(r'\*+')
+_RE_HEADING = re.compile(r'#+\s*')
+_RE_MDLINK = re.compile(r'\[.*?\]\(.*?\)')
+_RE_BULLET = re.compile(r'^[\-\*]\s+', re.MULTILINE)
+_RE_WS = re.compile(r'\s+')
+_RE_PLZ = re.compile(r'\b\d{5}\b')
+_RE_PHONE = re.compile(r'\b0\d[\d\-/]{6,}\b')
+_RE_DATE = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})?')
+_RE_TIME_HM_UHR = re.compile(r'(\d{1,2}):(\d{2})\s*Uhr\b')
+_RE_TIME_HM = re.compile(r'(\d{1,2}):(\d{2})')
+_RE_TIME_H_UHR = re.compile(r'(\d{1,2})\s*Uhr\b')
+
+# Tage als Ordinalzahlen (Index = Tag, Index 0 unbenutzt)
+_DAY_WORDS = (
+    "", "erster", "zweiter", "dritter", "vierter", "fuenfter",
+    "sechster", "siebter", "achter", "neunter", "zehnter",
+    "elfter", "zwoelfter", "dreizehnter", "vierzehnter",
+    "fuenfzehnter", "sechzehnter", "siebzehnter", "achtzehnter",
+    "neunzehnter", "zwanzigster", "einundzwanzigster",
+    "zweiundzwanzigster", "dreiundzwanzigster", "vierundzwanzigster",
+    "fuenfundzwanzigster", "sechsundzwanzigster", "siebenundzwanzigster",
+    "achtundzwanzigster", "neunundzwanzigster", "dreissigster",
+    "einunddreissigster",
+)
+
+# Index = Monat, Index 0 unbenutzt
+_MONTH_WORDS = (
+    "", "Januar", "Februar", "Maerz", "April", "Mai", "Juni",
+    "Juli", "August", "September", "Oktober", "November", "Dezember",
+)
+
+# Index = Stunde (0-23)
+_HOUR_WORDS = (
+    "null", "ein", "zwei", "drei", "vier", "fuenf",
+    "sechs", "sieben", "acht", "neun", "zehn",
+    "elf", "zwoelf", "dreizehn", "vierzehn", "fuenfzehn",
+    "sechzehn", "siebzehn", "achtzehn", "neunzehn",
+    "zwanzig", "einundzwanzig", "zweiundzwanzig", "dreiundzwanzig",
+)
+
+# Abkuerzungen, die ausgeschrieben werden (Tabelle in src.sentences, geteilt mit der Satzerkennung)
+_ABBREVIATIONS = {abbrev: full for abbrev, full in ABBREVIATIONS.items() if full}
+_ABBREVIATIONS["€"] = "Euro"
+# Laengste zuerst, damit "z. B." nicht von einer kuerzeren Alternative verdeckt wird
+_RE_ABBREV = re.compile(
+    '|'.join(re.escape(a) for a in sorted(_ABBREVIATIONS, key=len, reverse=True))
+)
+
+
+def _plz_to_digits(match):
+    return ' '.join(match.group(0))
+
+
+def _phone_to_digits(match):
+    num = match.group(0)
+    # Ziffern einzeln mit Leerzeichen
+    return ' '.join(num.replace('-', ' ').replace('/', ' '))
+
+
+def _date_to_speech(match):
+    day = int(match.group(1))
+    month = int(match.group(2))
+    year = match.group(3) if match.group(3) else ""
+
+    day_word = _DAY_WORDS[day] if 1 <= day <= 31 else str(day)
+    month_word = _MONTH_WORDS[month] if 1 <= month <= 12 else str(month)
+    result = day_word + " " + month_word
+
+    # Jahr nur wenn vorhanden und sinnvoll
+    if year and len(year) == 4:
+        result += " " + year
+
+    return result
+
+
+def _hour_word(hour):
+    return _HOUR_WORDS[hour] if 0 <= hour <= 23 else str(hour)
+
+
+def _time_with_minutes(match):
+    hour = int(match.group(1))
+    minute = match.group(2)
+
+    result = _hour_word(hour) + " Uhr"
+
+    if minute:
+        min_val = int(minute)
+        if min_val > 0:
+            if min_val < 10:
+                result += " null " + str(min_val)
+            else:
+                result += " " + str(min_val)
+
+    return result
+
+
+def _time_only_hour(match):
+    # "15 Uhr" -> "fuenfzehn Uhr"
+    hour = int(match.group(1))
+    return _hour_word(hour) + " Uhr"
+
+
+def _expand_abbreviation(match):
+    return _ABBREVIATIONS[match.group(0)]
+
+
+def _build_abbrev_automaton():
+    """Aho-Corasick-Automat ueber alle Abkuerzungen (falls pyahocorasick installiert)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for abbrev, full in _ABBREVIATIONS.items():
+        automaton.add_word(abbrev, (len(abbrev), full))
+    automaton.make_automaton()
+    return automaton
+
+
+_ABBREV_AUTOMATON = _build_abbrev_automaton()
+
+
+def _expand_abbreviations(text):
+    """
+    Loest alle Abkuerzungen in einem linearen Durchlauf auf.
+    Mit pyahocorasick: Automat mit laengstem Treffer (wie die Regex-Alternation),
+    sonst Fallback auf _RE_ABBREV.
+    """
+    if _ABBREV_AUTOMATON is None:
+        return _RE_ABBREV.sub(_expand_abbreviation, text)
+
+    parts = []
+    pos = 0
+    for end, (length, full) in _ABBREV_AUTOMATON.iter_long(text):
+        start = end - length + 1
+        parts.append(text[pos:start])
+        parts.append(full)
+        pos = end + 1
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+# Cache fuer fertige Asterisk-Audiodateien (gleiche Ansagen nicht neu erzeugen)
+TTS_CACHE_DIR = Path(os.environ.get("KI_TTS_CACHE_DIR", "/opt/ki-telefonassistent/cache/tts"))
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Nach so vielen Ablagen den Cache trotzdem neu vermessen (andere Prozesse schreiben mit)
+TTS_CACHE_RESCAN_EVERY = 200
+
+# Geschaetzte Cache-Groesse dieses Prozesses; None = noch nicht vermessen
+_cache_size = None
+_cache_stores = 0
+_cache_size_lock = threading.Lock()
+
+
+def _cache_key(text, voice):
+    """Inhaltsbasierter Schluessel aus Text, Stimme und Zielformat."""
+    return hashlib.blake2b(
+        f"{text}|{voice}|asterisk8k".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def _cache_fetch(key, output_path):
+    """Kopiert eine gecachte Datei nach output_path. True bei Treffer."""
+    cache_path = TTS_CACHE_DIR / f"{key}.wav"
+    try:
+        if cache_path.stat().st_size <= 100:
+            return False
+        shutil.copyfile(cache_path, output_path)
+        # Zugriffszeit explizit setzen (relatime/noatime) - Basis fuer die LRU-Verdraengung
+        os.utime(cache_path)
+    except OSError:
+        return False
+    logger.info(f"TTS aus Cache: {output_path}")
+    return True
+
+
+def _cache_store(key, output_path):
+    """Legt eine erzeugte Datei im Cache ab (Fehler werden ignoriert)."""
+    cache_path = TTS_CACHE_DIR / f"{key}.wav"
+    # Eindeutig pro Schreiber: zwei Worker koennen denselben Satz gleichzeitig ablegen
+    tmp_path = TTS_CACHE_DIR / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output_path, tmp_path)
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, cache_path)
+        _account_cache_store(size)
+    except OSError as e:
+        logger.debug(f"TTS-Cache nicht beschreibbar: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def _account_cache_store(size):
+    """
+    Zaehlt eine Ablage zur geschaetzten Cache-Groesse. Vollstaendig gescannt
+    wird nur, wenn die Schaetzung das Limit erreicht oder alle
+    TTS_CACHE_RESCAN_EVERY Ablagen - nicht mehr bei jedem Satz.
+    """
+    global _cache_size, _cache_stores
+    with _cache_size_lock:
+        _cache_stores += 1
+        if _cache_size is not None:
+            _cache_size += size
+        if (_cache_size is not None and _cache_size <= TTS_CACHE_MAX_BYTES
+                and _cache_stores % TTS_CACHE_RESCAN_EVERY):
+            return
+        _cache_size = _evict_cache()
+
+
+def _evict_cache():
+    """
+    Loescht die am laengsten nicht genutzten Dateien, wenn der Cache zu gross ist.
+    Gibt die Groesse danach zurueck.
+    """
+    entries = []
+    total = 0
+    for entry in os.scandir(TTS_CACHE_DIR):
+        if entry.name.endswith(".wav"):
+            stat = entry.stat()
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    if total <= TTS_CACHE_MAX_BYTES:
+        return total
+
+    entries.sort()
+    for _atime, size, path in entries:
+        if total <= TTS_CACHE_MAX_BYTES * 0.9:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+# /dev/null einmal pro Prozess oeffnen; Popen dupliziert die FDs beim Start
+# auf 0/1/2 des Kindes, daher koennen alle Aufrufe sie gemeinsam nutzen
+_DEVNULL_R = os.open(os.devnull, os.O_RDONLY)
+_DEVNULL_W = os.open(os.devnull, os.O_WRONLY)
+
 
 def _run_isolated(cmd_args, stdin_file_path=None, timeout=30):
     """
@@ -36,27 +306,17 @@ def _run_isolated(cmd_args, stdin_file_path=None, timeout=30):
     KEIN subprocess.PIPE verwenden - das kann blocken wenn der
     Parent-Prozess (AGI) gekillt wird bevor die Pipe gelesen wird.
     """
-    devnull_r = None
-    devnull_w1 = None
-    devnull_w2 = None
-    stdin_fd = None
+    stdin_fd = _DEVNULL_R
     try:
-        # /dev/null oeffnen - separate Handles fuer stdout und stderr
-        devnull_w1 = open(os.devnull, "w")
-        devnull_w2 = open(os.devnull, "w")
-
         # stdin: entweder aus Datei oder /dev/null
         if stdin_file_path:
-            stdin_fd = open(stdin_file_path, "r")
-        else:
-            devnull_r = open(os.devnull, "r")
-            stdin_fd = devnull_r
+            stdin_fd = os.open(stdin_file_path, os.O_RDONLY)
 
         proc = subprocess.Popen(
             cmd_args,
             stdin=stdin_fd,
-            stdout=devnull_w1,
-            stderr=devnull_w2,
+            stdout=_DEVNULL_W,
+            stderr=_DEVNULL_W,
             close_fds=True,
             start_new_session=True,
         )
@@ -71,22 +331,241 @@ def _run_isolated(cmd_args, stdin_file_path=None, timeout=30):
         return proc.returncode, ""
 
     finally:
-        if stdin_file_path and stdin_fd:
-            stdin_fd.close()
-        if devnull_r:
-            devnull_r.close()
-        if devnull_w1:
-            devnull_w1.close()
-        if devnull_w2:
-            devnull_w2.close()
+        if stdin_fd != _DEVNULL_R:
+            os.close(stdin_fd)
+
+
+def _valid_audio(path):
+    """True, wenn die Datei existiert und mehr als nur einen WAV-Header enthaelt."""
+    try:
+        return os.path.getsize(path) >= 100
+    except OSError:
+        return False
+
+
+ASTERISK_SAMPLE_RATE = 8000
+
+
+_WAV_HEADER_FORMAT = "<4sI4s4sIHHIIHH4sI"
+WAV_HEADER_SIZE = struct.calcsize(_WAV_HEADER_FORMAT)
+
+
+def _pack_wav_header(buffer, data_size, sample_rate):
+    """Schreibt den 44-Byte-Header (16-bit PCM, Mono) in buffer."""
+    struct.pack_into(
+        _WAV_HEADER_FORMAT, buffer, 0,
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_size,
+    )
+
+
+def _write_wav(path, pcm, sample_rate):
+    """Schreibt 16-bit Mono-PCM mit minimalem 44-Byte-WAV-Header."""
+    header = bytearray(WAV_HEADER_SIZE)
+    _pack_wav_header(header, len(pcm), sample_rate)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(pcm)
+
+
+def _resample(samples, src_rate, dst_rate):
+    """
+    Polyphasen-Resampling (scipy) mit Tiefpass; ohne scipy ein gefensterter
+    Sinc-Tiefpass plus lineare Interpolation in NumPy.
+    """
+    divisor = math.gcd(src_rate, dst_rate)
+    up, down = dst_rate // divisor, src_rate // divisor
+    if resample_poly is not None:
+        return resample_poly(samples, up, down)
+
+    # Grenzfrequenz knapp unter der neuen Nyquist-Frequenz
+    cutoff = 0.45 * dst_rate / src_rate
+    n = np.arange(63) - 31
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(63)
+    filtered = np.convolve(samples, taps / taps.sum(), mode="same")
+    positions = np.arange(len(samples) * up // down) * (down / up)
+    return np.interp(positions, np.arange(len(samples)), filtered)
+
+
+def _wav_to_asterisk(src_path, dst_path):
+    """
+    Wandelt Pipers WAV (native Rate, meist 22050 Hz) in 8kHz 16-bit Mono um.
+    Laeuft im Prozess statt ueber sox; sox nur ohne NumPy oder bei
+    ungewoehnlichem Eingangsformat.
+    """
+    with wave.open(src_path, "rb") as wav:
+        src_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        frames = wav.readframes(wav.getnframes())
+
+    if np is None or sample_width != 2:
+        returncode, stderr = _run_isolated(
+            [
+                "sox", src_path,
+                "-r", str(ASTERISK_SAMPLE_RATE),
+                "-c", "1",
+                "-b", "16",
+                dst_path,
+            ],
+            timeout=10,
+        )
+        if returncode != 0:
+            logger.error(f"Sox-Fehler (code {returncode}): {stderr[:200]}")
+        return returncode == 0 and _valid_audio(dst_path)
+
+    samples = np.frombuffer(frames, dtype="<i2").astype(np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if src_rate != ASTERISK_SAMPLE_RATE:
+        samples = _resample(samples, src_rate, ASTERISK_SAMPLE_RATE)
+
+    pcm = np.clip(np.rint(samples), -32768, 32767).astype("<i2").tobytes()
+    _write_wav(dst_path, pcm, ASTERISK_SAMPLE_RATE)
+    return _valid_audio(dst_path)
+
+
+def _ulaw_to_linear(value):
+    """Dekodiert ein G.711-u-law-Byte zu einem 16-bit-Sample."""
+    value = ~value & 0xFF
+    magnitude = (((value & 0x0F) << 3) + 0x84) << ((value & 0x70) >> 4)
+    return 0x84 - magnitude if value & 0x80 else magnitude - 0x84
+
+
+# u-law-Byte -> 2 Bytes little-endian PCM (Nachschlagetabelle statt audioop)
+_ULAW_TO_PCM = [struct.pack("<h", _ulaw_to_linear(value)) for value in range(256)]
+
+
+def _write_ulaw_stream_as_wav(chunks, output_path):
+    """
+    Schreibt u-law-Chunks (8kHz, Mono) als 16-bit-PCM-WAV, waehrend sie
+    eintreffen; der Header wird am Ende gepatcht. Gibt die Anzahl
+    empfangener u-law-Bytes zurueck.
+    """
+    header = bytearray(WAV_HEADER_SIZE)
+    received = 0
+    with open(output_path, "wb") as out:
+        out.write(header)
+        for chunk in chunks:
+            if chunk:
+                out.write(b"".join([_ULAW_TO_PCM[value] for value in chunk]))
+                received += len(chunk)
+        _pack_wav_header(header, received * 2, ASTERISK_SAMPLE_RATE)
+        out.seek(0)
+        out.write(header)
+    return received
+
+
+def _split_sentences(text):
+    """Teilt Text an Satzenden (gleiche Regeln wie beim LLM-Streaming)."""
+    return list(iter_sentences([text]))
+
+
+def _done_future(result):
+    """Bereits erledigtes Future (z.B. fuer Cache-Treffer)."""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class _PiperServer:
+    """
+    Dauerhaft laufender Piper-Prozess (--json-input), damit das ONNX-Modell
+    nur einmal pro Prozess geladen wird statt bei jeder Ansage.
+
+    Pro Zeile auf stdin ein JSON-Objekt {"text", "output_file"}; Piper
+    schreibt die WAV-Datei und meldet den Pfad als Zeile auf stdout.
+    stderr geht nach /dev/null, die Pipes verbinden nur uns und Piper -
+    nie den AGI-Kanal.
+    """
+
+    def __init__(self, piper_path, voice_path):
+        self._lock = threading.Lock()
+        self._proc = subprocess.Popen(
+            [
+                piper_path,
+                "--model", voice_path,
+                "--json-input",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=_DEVNULL_W,
+            close_fds=True,
+            start_new_session=True,
+        )
+        atexit.register(self.close)
+
+    def alive(self):
+        return self._proc.poll() is None
+
+    def synthesize(self, text, output_path, timeout=30):
+        """Erzeugt output_path ueber den laufenden Prozess. True bei Erfolg."""
+        with self._lock:
+            if not self.alive():
+                return False
+            request = json.dumps({"text": text, "output_file": output_path}) + "\n"
+            try:
+                self._proc.stdin.write(request.encode("utf-8"))
+                self._proc.stdin.flush()
+            except (BrokenPipeError, OSError):
+                return False
+
+            if self._read_ack(timeout) is None:
+                # Zustand unklar (haengt oder abgestuerzt) - Prozess verwerfen
+                self._terminate()
+                return False
+            return True
+
+    def _read_ack(self, timeout):
+        """Liest eine Antwortzeile von stdout, hoechstens timeout Sekunden."""
+        fd = self._proc.stdout.fileno()
+        deadline = time.time() + timeout
+        line = b""
+        while not line.endswith(b"\n"):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                return None
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                return None
+            line += chunk
+        return line
+
+    def _terminate(self):
+        if self.alive():
+            self._proc.kill()
+        self._proc.wait()
+
+    def close(self):
+        """Schliesst stdin (Piper beendet sich bei EOF), notfalls kill."""
+        if not self.alive():
+            return
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self._terminate()
 
 
 class TTSEngine:
     def __init__(self, piper_path="/opt/piper/piper",
-                 voice_path="/opt/piper/voices/de_DE-thorsten-high.onnx"):
+                 voice_path="/opt/piper/voices/de_DE-thorsten-high.onnx",
+                 preload=True):
         self.piper_path = piper_path
         self.voice_path = voice_path
+        self._server = None
+        self._server_failed = False
+        self._server_lock = threading.Lock()
+        # Hintergrund-Synthese fuer synthesize_async (naechster Satz waehrend Wiedergabe)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="piper")
         self._verify_installation()
+        if preload:
+            # Modell laedt im Hintergrund, waehrend der Anruf aufgebaut wird
+            self._get_server()
 
     def _verify_installation(self):
         """Prueft ob Piper installiert ist."""
@@ -100,8 +579,79 @@ class TTSEngine:
                 f"Piper-Stimme nicht gefunden: {self.voice_path}. "
                 "Bitte install.sh ausfuehren."
             )
+        # int8-quantisierte Stimme bevorzugen (scripts/quantize_piper_voice.py)
+        if self.voice_path.endswith(".onnx") and not self.voice_path.endswith(".int8.onnx"):
+            int8_voice = self.voice_path[: -len(".onnx")] + ".int8.onnx"
+            if Path(int8_voice).exists() and Path(int8_voice + ".json").exists():
+                self.voice_path = int8_voice
         logger.info(f"Piper TTS bereit. Stimme: {Path(self.voice_path).stem}")
 
+    def _get_server(self):
+        """
+        Gibt den persistenten Piper-Prozess zurueck (startet ihn bei Bedarf).
+        None, wenn er nicht startet - dann wird pro Ansage ein Piper gestartet.
+        """
+        with self._server_lock:
+            return self._start_server()
+
+    def _start_server(self):
+        if self._server is not None and self._server.alive():
+            return self._server
+        if self._server_failed:
+            return None
+        if self._server is not None:
+            logger.warning("Piper-Server beendet, starte neu")
+            # Nur ein Neustart - stirbt er wieder, bleibt es beim Einzelstart
+            self._server_failed = True
+        try:
+            self._server = _PiperServer(self.piper_path, self.voice_path)
+        except OSError as e:
+            logger.warning(f"Piper-Server nicht startbar ({e}), nutze Einzelstart")
+            self._server = None
+            self._server_failed = True
+        return self._server
+
+    def _synthesize_wav(self, text, output_path):
+        """
+        Schreibt die WAV-Datei von Piper nach output_path (native Abtastrate).
+        Bevorzugt den persistenten Prozess, sonst Piper isoliert pro Aufruf.
+        """
+        server = self._get_server()
+        if server is not None:
+            if server.synthesize(text, output_path) and _valid_audio(output_path):
+                return True
+            logger.warning("Piper-Server ohne Ergebnis, nutze Einzelstart")
+
+        text_file = None
+        try:
+            text_file = tempfile.NamedTemporaryFile(
+                mode="w", suffix=".txt", delete=False, prefix="tts_input_"
+            )
+            text_file.write(text)
+            text_file.close()
+
+            # Piper starten - komplett isoliert vom AGI-Kontext
+            logger.info("TTS: Starte Piper (isoliert)...")
+            returncode, stderr = _run_isolated(
+                [
+                    self.piper_path,
+                    "--model", self.voice_path,
+                    "--output_file", output_path,
+                ],
+                stdin_file_path=text_file.name,
+                timeout=30,
+            )
+            if returncode != 0:
+                logger.error(f"Piper-Fehler (code {returncode}): {stderr[:200]}")
+                return False
+            return _valid_audio(output_path)
+        finally:
+            if text_file:
+                try:
+                    Path(text_file.name).unlink(missing_ok=True)
+                except OSError:
+                    pass
+
     def synthesize(self, text, output_path=None):
         """
         Wandelt Text in Sprache um.
@@ -132,33 +682,8 @@ class TTSEngine:
         logger.info(f"TTS Synthesize Start: '{text[:60]}...' -> {output_path}")
         start = time.time()
 
-        # Text in temporaere Datei schreiben
-        text_file = None
         try:
-            text_file = tempfile.NamedTemporaryFile(
-                mode="w", suffix=".txt", delete=False, prefix="tts_input_"
-            )
-            text_file.write(text)
-            text_file.close()
-
-            # Piper starten - komplett isoliert vom AGI-Kontext
-            logger.info("TTS: Starte Piper (isoliert)...")
-            returncode, stderr = _run_isolated(
-                [
-                    self.piper_path,
-                    "--model", self.voice_path,
-                    "--output_file", output_path,
-                ],
-                stdin_file_path=text_file.name,
-                timeout=30,
-            )
-
-            if returncode != 0:
-                logger.error(f"Piper-Fehler (code {returncode}): {stderr[:200]}")
-                return None
-
-            # Pruefen ob Datei erzeugt wurde
-            if not Path(output_path).exists() or Path(output_path).stat().st_size < 100:
+            if not self._synthesize_wav(text, output_path):
                 logger.error(f"Piper hat keine gueltige Datei erzeugt: {output_path}")
                 return None
 
@@ -170,193 +695,148 @@ class TTSEngine:
         except Exception as e:
             logger.error(f"TTS-Fehler: {e}")
             return None
-        finally:
-            # Text-Datei aufraeumen
-            if text_file:
-                try:
-                    Path(text_file.name).unlink(missing_ok=True)
-                except OSError:
-                    pass
+
+    def synthesize_async(self, text, output_path):
+        """
+        Wie synthesize_to_asterisk_format, aber im Hintergrund.
+        Gibt ein Future mit dem Pfad (oder None) zurueck; Cache-Treffer
+        sind sofort erledigt.
+        """
+        output_path = str(output_path)
+        if text and text.strip() and _cache_fetch(_cache_key(text, self.voice_path), output_path):
+            return _done_future(output_path)
+        return self._pool.submit(self.synthesize_to_asterisk_format, text, output_path)
 
     def synthesize_to_asterisk_format(self, text, output_path):
         """
         Erzeugt Audio im Asterisk-kompatiblen Format.
         (16-bit PCM, 8kHz, Mono fuer alaw/ulaw)
+        Nutzt den persistenten Piper-Prozess (Modell bleibt geladen) und
+        rechnet die Abtastrate im Prozess um - ohne sox-Aufruf.
         """
-        # Erst normal erzeugen
-        raw_path = self.synthesize(text)
-        if raw_path is None:
+        if not text or not text.strip():
+            logger.warning("Leerer Text fuer TTS uebergeben")
             return None
 
-        # Dann konvertieren mit sox (auch isoliert)
-        try:
-            logger.info("TTS: Starte Sox-Konvertierung (isoliert)...")
-            returncode, stderr = _run_isolated(
-                [
-                    "sox", raw_path,
-                    "-r", "8000",
-                    "-c", "1",
-                    "-b", "16",
-                    output_path,
-                ],
-                timeout=10,
-            )
+        output_path = str(output_path)
+        cache_key = _cache_key(text, self.voice_path)
+        if _cache_fetch(cache_key, output_path):
+            return output_path
 
-            # Temporaere Datei aufraeumen
-            Path(raw_path).unlink(missing_ok=True)
+        sentences = _split_sentences(text)
 
-            if returncode != 0:
-                logger.error(f"Sox-Fehler (code {returncode}): {stderr[:200]}")
-                return None
+        logger.info(f"TTS Start (Piper, {len(sentences)} Satz/Saetze): '{text[:60]}...' -> {output_path}")
+        start = time.time()
 
-            if Path(output_path).exists():
-                logger.info(f"Sox-Konvertierung OK: {output_path}")
-                return output_path
+        try:
+            if len(sentences) > 1:
+                rendered = self._render_sentences(sentences, output_path)
             else:
-                logger.error("Konvertierung fehlgeschlagen")
+                rendered = self._render_asterisk(self._clean_text(text), output_path)
+            if not rendered:
+                logger.error(f"Keine gueltige Audiodatei erzeugt: {output_path}")
                 return None
 
+            duration = time.time() - start
+            logger.info(f"TTS erzeugt ({duration:.1f}s): {output_path}")
+            _cache_store(cache_key, output_path)
+            return output_path
+
         except Exception as e:
-            logger.error(f"Audio-Konvertierung fehlgeschlagen: {e}")
-            Path(raw_path).unlink(missing_ok=True)
+            logger.error(f"TTS-Fehler: {e}")
             return None
 
+    def _render_sentences(self, sentences, output_path):
+        """
+        Erzeugt jeden Satz einzeln (mit eigenem Cache-Eintrag, wie bei den
+        gestreamten LLM-Saetzen) und haengt die PCM-Daten an eine gemeinsame
+        WAV-Datei. Der Header wird am Ende mit der Gesamtgroesse gepatcht.
+        So kommen wiederkehrende Saetze aus dem Cache, auch wenn der Rest neu ist.
+        """
+        header = bytearray(WAV_HEADER_SIZE)
+        data_size = 0
+        rendered = False
+        try:
+            with open(output_path, "wb") as out:
+                out.write(header)
+                for index, sentence in enumerate(sentences):
+                    part_path = f"{output_path}.part{index}.wav"
+                    try:
+                        part_key = _cache_key(sentence, self.voice_path)
+                        if not _cache_fetch(part_key, part_path):
+                            if not self._render_asterisk(self._clean_text(sentence), part_path):
+                                return False
+                            _cache_store(part_key, part_path)
+                        with wave.open(part_path, "rb") as part:
+                            pcm = part.readframes(part.getnframes())
+                    finally:
+                        Path(part_path).unlink(missing_ok=True)
+                    out.write(pcm)
+                    data_size += len(pcm)
+
+                _pack_wav_header(header, data_size, ASTERISK_SAMPLE_RATE)
+                out.seek(0)
+                out.write(header)
+            rendered = _valid_audio(output_path)
+            return rendered
+        finally:
+            if not rendered:
+                # Keine halbe Datei mit Platzhalter-Header liegen lassen
+                Path(output_path).unlink(missing_ok=True)
+
+    def _render_asterisk(self, text, output_path):
+        """
+        Erzeugt die 8kHz-Datei: Piper schreibt WAV in nativer Rate
+        (persistenter Prozess oder Einzelstart), das Resampling auf
+        8kHz laeuft danach im Prozess.
+        """
+        piper_wav = output_path + ".piper.wav"
+        try:
+            if not self._synthesize_wav(text, piper_wav):
+                return False
+            return _wav_to_asterisk(piper_wav, output_path)
+        finally:
+            Path(piper_wav).unlink(missing_ok=True)
+
     def _clean_text(self, text):
         """
         Bereinigt Text fuer die Sprachausgabe.
         Entfernt Sonderzeichen, die Piper nicht gut handhabt.
         Zahlen wie PLZ werden als Einzelziffern ausgesprochen.
         """
-        import re
-
         # Markdown/Formatierung entfernen
-        text = re.sub(r'\*+', '', text)
-        text = re.sub(r'#+\s*', '', text)
-        text = re.sub(r'\[.*?\]\(.*?\)', '', text)
+        text = _RE_STARS.sub('', text)
+        text = _RE_HEADING.sub('', text)
+        text = _RE_MDLINK.sub('', text)
 
         # Aufzaehlungszeichen ersetzen
-        text = re.sub(r'^[\-\*]\s+', '', text, flags=re.MULTILINE)
+        text = _RE_BULLET.sub('', text)
 
         # Mehrfache Leerzeichen
-        text = re.sub(r'\s+', ' ', text)
+        text = _RE_WS.sub(' ', text)
 
         # Postleitzahlen (5 Ziffern) als einzelne Ziffern aussprechen
         # z.B. "86381" -> "8 6 3 8 1"
-        def plz_to_digits(match):
-            return ' '.join(match.group(0))
-        text = re.sub(r'\b\d{5}\b', plz_to_digits, text)
+        text = _RE_PLZ.sub(_plz_to_digits, text)
 
         # Hausnummern (1-4 Ziffern nach Strassenname) normal lassen
         # Telefonnummern als Zifferngruppen aussprechen
-        def phone_to_digits(match):
-            num = match.group(0)
-            # Ziffern einzeln mit Leerzeichen
-            return ' '.join(num.replace('-', ' ').replace('/', ' '))
-        text = re.sub(r'\b0\d[\d\-/]{6,}\b', phone_to_digits, text)
-
-        # Datum formatieren fuer natuerliche Aussprache
-        # z.B. "23.02.2026" -> "dreiundzwanzigster Februar zweitausendsechsundzwanzig"
-        def date_to_speech(match):
-            day = int(match.group(1))
-            month = int(match.group(2))
-            year = match.group(3) if match.group(3) else ""
-
-            # Tage als Ordinalzahlen
-            day_words = {
-                1: "erster", 2: "zweiter", 3: "dritter", 4: "vierter", 5: "fuenfter",
-                6: "sechster", 7: "siebter", 8: "achter", 9: "neunter", 10: "zehnter",
-                11: "elfter", 12: "zwoelfter", 13: "dreizehnter", 14: "vierzehnter",
-                15: "fuenfzehnter", 16: "sechzehnter", 17: "siebzehnter", 18: "achtzehnter",
-                19: "neunzehnter", 20: "zwanzigster", 21: "einundzwanzigster",
-                22: "zweiundzwanzigster", 23: "dreiundzwanzigster", 24: "vierundzwanzigster",
-                25: "fuenfundzwanzigster", 26: "sechsundzwanzigster", 27: "siebenundzwanzigster",
-                28: "achtundzwanzigster", 29: "neunundzwanzigster", 30: "dreissigster",
-                31: "einunddreissigster"
-            }
-
-            # Monate
-            month_words = {
-                1: "Januar", 2: "Februar", 3: "Maerz", 4: "April", 5: "Mai", 6: "Juni",
-                7: "Juli", 8: "August", 9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
-            }
-
-            result = day_words.get(day, str(day)) + " " + month_words.get(month, str(month))
-
-            if year:
-                # Jahr nur wenn vorhanden und sinnvoll
-                if len(year) == 4:
-                    result += " " + year
-
-            return result
+        text = _RE_PHONE.sub(_phone_to_digits, text)
 
         # Datum im Format DD.MM.YYYY oder DD.MM.
-        text = re.sub(r'(\d{1,2})\.(\d{1,2})\.(\d{4})?', date_to_speech, text)
-
-        # Uhrzeit formatieren
-        # z.B. "14:30" -> "vierzehn Uhr dreissig"
-        def time_with_minutes(match):
-            hour = int(match.group(1))
-            minute = match.group(2)
-
-            hour_words = {
-                0: "null", 1: "ein", 2: "zwei", 3: "drei", 4: "vier", 5: "fuenf",
-                6: "sechs", 7: "sieben", 8: "acht", 9: "neun", 10: "zehn",
-                11: "elf", 12: "zwoelf", 13: "dreizehn", 14: "vierzehn", 15: "fuenfzehn",
-                16: "sechzehn", 17: "siebzehn", 18: "achtzehn", 19: "neunzehn",
-                20: "zwanzig", 21: "einundzwanzig", 22: "zweiundzwanzig", 23: "dreiundzwanzig"
-            }
-
-            result = hour_words.get(hour, str(hour)) + " Uhr"
-
-            if minute:
-                min_val = int(minute)
-                if min_val > 0:
-                    if min_val < 10:
-                        result += " null " + str(min_val)
-                    else:
-                        result += " " + str(min_val)
-
-            return result
-
-        # "15 Uhr" -> "fuenfzehn Uhr"
-        def time_only_hour(match):
-            hour = int(match.group(1))
-            hour_words = {
-                0: "null", 1: "ein", 2: "zwei", 3: "drei", 4: "vier", 5: "fuenf",
-                6: "sechs", 7: "sieben", 8: "acht", 9: "neun", 10: "zehn",
-                11: "elf", 12: "zwoelf", 13: "dreizehn", 14: "vierzehn", 15: "fuenfzehn",
-                16: "sechzehn", 17: "siebzehn", 18: "achtzehn", 19: "neunzehn",
-                20: "zwanzig", 21: "einundzwanzig", 22: "zweiundzwanzig", 23: "dreiundzwanzig"
-            }
-            return hour_words.get(hour, str(hour)) + " Uhr"
+        # z.B. "23.02.2026" -> "dreiundzwanzigster Februar 2026"
+        text = _RE_DATE.sub(_date_to_speech, text)
 
+        # Uhrzeit formatieren, z.B. "14:30" -> "vierzehn Uhr 30"
         # Uhrzeit im Format HH:MM Uhr (mit optionalem "Uhr" danach)
-        text = re.sub(r'(\d{1,2}):(\d{2})\s*Uhr\b', time_with_minutes, text)
+        text = _RE_TIME_HM_UHR.sub(_time_with_minutes, text)
         # Uhrzeit im Format HH:MM (ohne "Uhr")
-        text = re.sub(r'(\d{1,2}):(\d{2})', time_with_minutes, text)
+        text = _RE_TIME_HM.sub(_time_with_minutes, text)
         # Uhrzeit im Format "15 Uhr" (ohne Minuten)
-        text = re.sub(r'(\d{1,2})\s*Uhr\b', time_only_hour, text)
-
-        # Abkuerzungen aufloesen fuer bessere Aussprache
-        replacements = {
-            "z.B.": "zum Beispiel",
-            "z. B.": "zum Beispiel",
-            "d.h.": "das heisst",
-            "d. h.": "das heisst",
-            "u.a.": "unter anderem",
-            "u. a.": "unter anderem",
-            "ca.": "circa",
-            "bzgl.": "bezueglich",
-            "inkl.": "inklusive",
-            "zzgl.": "zuzueglich",
-            "MwSt.": "Mehrwertsteuer",
-            "Tel.": "Telefon",
-            "Nr.": "Nummer",
-            "Str.": "Strasse",
-            "€": "Euro",
-        }
-        for abbrev, full in replacements.items():
-            text = text.replace(abbrev, full)
+        text = _RE_TIME_H_UHR.sub(_time_only_hour, text)
+
+        # Abkuerzungen aufloesen fuer bessere Aussprache (ein Durchlauf)
+        text = _expand_abbreviations(text)
 
         # Natuerlichere Pausen einbauen (Komma = kurze Pause)
         text = text.replace(",", ", ")
@@ -374,27 +854,63 @@ class ElevenLabsTTSEngine:
     # Native deutsche Stimme - Adrian (vertrauenswuerdig, professionell)
     DEFAULT_VOICE_ID = "aduJlSmEKqbhRQAAMzV2"  # Adrian - native German male voice
 
+    # Gleichzeitige ElevenLabs-Anfragen pro Prozess begrenzen (alle Instanzen)
+    MAX_CONCURRENT_REQUESTS = 8
+    _request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+    _waiting = 0
+    _waiting_lock = threading.Lock()
+    # Nach HTTP 429: bis zu diesem Zeitpunkt direkt Piper nutzen
+    _backoff_until = 0.0
+
     def __init__(self, api_key, voice_id=None, piper_path=None, piper_voice=None):
         self.api_key = api_key
         self.voice_id = voice_id or self.DEFAULT_VOICE_ID
         self.model_id = "eleven_flash_v2_5"  # Schnellstes Modell (~75ms)
         self.api_url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream"
+        # Keep-Alive-Session: spart DNS + TCP + TLS-Handshake bei jeder Ansage
+        self._session = None
+        if requests:
+            self._session = create_session(pool_connections=4, pool_maxsize=8)
+            self._session.headers.update({
+                "xi-api-key": self.api_key,
+                "Content-Type": "application/json",
+            })
         self._piper_fallback = None
         if piper_path and piper_voice:
-            self._piper_fallback = TTSEngine(piper_path, piper_voice)
+            # Piper-Prozess erst starten, wenn der Fallback gebraucht wird
+            self._piper_fallback = TTSEngine(piper_path, piper_voice, preload=False)
         self._text_cleaner = TTSEngine.__new__(TTSEngine)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="elevenlabs")
         logger.info(f"ElevenLabs TTS bereit. Voice: {self.voice_id}, Model: {self.model_id}")
 
+    def _cache_voice(self):
+        return f"elevenlabs:{self.voice_id}:{self.model_id}"
+
+    def synthesize_async(self, text, output_path):
+        """
+        Wie synthesize_to_asterisk_format, aber im Hintergrund.
+        Gibt ein Future mit dem Pfad (oder None) zurueck; Cache-Treffer
+        sind sofort erledigt.
+        """
+        output_path = str(output_path)
+        if text and text.strip() and _cache_fetch(_cache_key(text, self._cache_voice()), output_path):
+            return _done_future(output_path)
+        return self._pool.submit(self.synthesize_to_asterisk_format, text, output_path)
+
     def synthesize_to_asterisk_format(self, text, output_path):
         """
         Erzeugt Audio im Asterisk-Format ueber ElevenLabs Streaming API.
-        Nutzt pcm_16000 und konvertiert via sox zu 8kHz WAV.
+        Fordert ulaw_8000 an und dekodiert es beim Empfang zu 8kHz WAV.
         Fallback auf Piper bei Fehler.
         """
         if not text or not text.strip():
             logger.warning("Leerer Text fuer TTS")
             return None
 
+        cache_key = _cache_key(text, self._cache_voice())
+        if _cache_fetch(cache_key, output_path):
+            return output_path
+
         if not requests:
             logger.warning("requests nicht verfuegbar, nutze Piper Fallback")
             return self._fallback_piper(text, output_path)
@@ -402,16 +918,53 @@ class ElevenLabsTTSEngine:
         # Text bereinigen (nutzt die gleiche Logik wie Piper)
         text = self._text_cleaner._clean_text(text)
 
+        if time.time() < ElevenLabsTTSEngine._backoff_until:
+            logger.info("ElevenLabs Rate-Limit aktiv - nutze Piper Fallback")
+            return self._fallback_piper(text, output_path)
+
         logger.info(f"ElevenLabs TTS Start: '{text[:60]}...'")
         start = time.time()
 
         try:
-            resp = requests.post(
+            total_bytes = self._request_audio(text, output_path)
+            if total_bytes is None:
+                return self._fallback_piper(text, output_path)
+
+            if total_bytes < 100:
+                logger.error("ElevenLabs hat keine gueltigen Audiodaten geliefert")
+                Path(output_path).unlink(missing_ok=True)
+                return self._fallback_piper(text, output_path)
+
+            duration = time.time() - start
+            logger.info(f"ElevenLabs TTS fertig ({duration:.1f}s): {output_path}")
+            _cache_store(cache_key, output_path)
+            return output_path
+
+        except requests.Timeout:
+            logger.warning("ElevenLabs Timeout - nutze Piper Fallback")
+            return self._fallback_piper(text, output_path)
+        except Exception as e:
+            logger.error(f"ElevenLabs Fehler: {e} - nutze Piper Fallback")
+            return self._fallback_piper(text, output_path)
+
+    def _request_audio(self, text, output_path):
+        """
+        Holt die Sprachausgabe von ElevenLabs und schreibt sie nach output_path.
+        Laeuft in einem der begrenzten Anfrage-Slots. Gibt die Anzahl
+        empfangener Bytes zurueck oder None bei einem API-Fehler.
+        """
+        cls = ElevenLabsTTSEngine
+        with cls._waiting_lock:
+            cls._waiting += 1
+            logger.debug("ElevenLabs Warteschlange: %d Anfrage(n)", cls._waiting)
+        cls._request_slots.acquire()
+        with cls._waiting_lock:
+            cls._waiting -= 1
+
+        try:
+            resp = self._session.post(
                 self.api_url,
-                headers={
-                    "xi-api-key": self.api_key,
-                    "Content-Type": "application/json",
-                },
+                params={"output_format": "ulaw_8000"},
                 json={
                     "text": text,
                     "model_id": self.model_id,
@@ -421,59 +974,36 @@ class ElevenLabsTTSEngine:
                         "style": 0.15,  # Etwas expressiver
                         "use_speaker_boost": True,
                     },
-                    "output_format": "mp3_22050_32",
                 },
                 stream=True,
                 timeout=15,
             )
 
+            if resp.status_code == 429:
+                self._start_backoff(resp.headers.get("Retry-After"))
+                return None
             if resp.status_code != 200:
                 logger.error(f"ElevenLabs API Fehler {resp.status_code}: {resp.text[:200]}")
-                return self._fallback_piper(text, output_path)
-
-            # MP3-Daten in temp-Datei streamen
-            mp3_file = tempfile.NamedTemporaryFile(
-                suffix=".mp3", delete=False, prefix="elevenlabs_"
-            )
-            total_bytes = 0
-            for chunk in resp.iter_content(chunk_size=4096):
-                if chunk:
-                    mp3_file.write(chunk)
-                    total_bytes += len(chunk)
-            mp3_file.close()
-
-            if total_bytes < 100:
-                logger.error("ElevenLabs hat keine gueltigen Audiodaten geliefert")
-                Path(mp3_file.name).unlink(missing_ok=True)
-                return self._fallback_piper(text, output_path)
+                return None
 
-            # MP3 -> WAV 8kHz konvertieren mit sox (isoliert)
-            returncode, stderr = _run_isolated(
-                [
-                    "sox",
-                    mp3_file.name,
-                    "-r", "8000", "-c", "1", "-b", "16",
-                    output_path,
-                ],
-                timeout=10,
+            # u-law kommt schon mit 8kHz - waehrend des Downloads direkt
+            # in 16-bit PCM dekodieren (kein sox, kein Tempfile)
+            return _write_ulaw_stream_as_wav(
+                resp.iter_content(chunk_size=4096), output_path
             )
+        finally:
+            cls._request_slots.release()
 
-            Path(mp3_file.name).unlink(missing_ok=True)
-
-            if returncode != 0:
-                logger.error(f"Sox-Fehler bei ElevenLabs-Audio: {stderr[:200]}")
-                return self._fallback_piper(text, output_path)
-
-            duration = time.time() - start
-            logger.info(f"ElevenLabs TTS fertig ({duration:.1f}s): {output_path}")
-            return output_path
-
-        except requests.Timeout:
-            logger.warning("ElevenLabs Timeout - nutze Piper Fallback")
-            return self._fallback_piper(text, output_path)
-        except Exception as e:
-            logger.error(f"ElevenLabs Fehler: {e} - nutze Piper Fallback")
-            return self._fallback_piper(text, output_path)
+    @classmethod
+    def _start_backoff(cls, retry_after):
+        """Pausiert ElevenLabs fuer Retry-After Sekunden (5-60 s)."""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = 5.0
+        delay = min(max(delay, 5.0), 60.0)
+        cls._backoff_until = time.time() + delay
+        logger.warning(f"ElevenLabs Rate-Limit (429) - {delay:.0f}s Piper Fallback")
 
     def _fallback_piper(self, text, output_path):
         """Fallback auf lokales Piper TTS."""
@@ -4,15 +4,31 @@ Zeigt Anrufübersicht, Statistiken und Gesprächsverläufe.
 """
 
 import logging
+import collections
 import functools
+import gzip
+import hashlib
+import hmac
 import json
+import select
 import time
-import queue
 import threading
-from flask import Flask, render_template_string, jsonify, request, Response
+from datetime import datetime
+from html import escape as _esc
+from flask import Flask, jsonify, request, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from src.call_database import (
-    init_database, get_recent_calls, get_stats, get_call_history,
+    init_database, get_recent_calls, get_stats, get_call_history, get_data_version,
+    open_change_listener,
 )
 from src.config_loader import load_config, list_available_businesses
 from src.booking_database import init_booking_tables
@@ -23,51 +39,304 @@ from src.customer_portal import customer_portal
 
 logger = logging.getLogger(__name__)
 
+
+def _json_bytes(data):
+    """JSON als UTF-8-Bytes; mit orjson (optional) deutlich schneller."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode("utf-8")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    jsonify() ueber orjson. Datum/Uhrzeit, Decimal und __html__ laufen weiter
+    ueber Flasks default, damit sich das Antwortformat nicht aendert.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 config = load_config()
 app.secret_key = config["web_secret_key"]
 
-# CORS fuer Booking-API und Kunden-API
-CORS(app, resources={r"/api/booking/*": {"origins": "*"}, r"/api/kunde/*": {"origins": "*"}})
 
 # --- Server-Sent Events fuer Echtzeit-Updates ---
-sse_clients = []
+# Read-Copy-Update: sse_clients ist ein unveraenderliches Tupel und wird bei
+# Connect/Disconnect komplett ersetzt. broadcast_update liest ohne Lock,
+# sse_lock serialisiert nur die (seltenen) Schreiber.
+sse_clients = ()
 sse_lock = threading.Lock()
-_last_call_count = 0
 
+SSE_BUFFER_SIZE = 32          # Nachrichten pro Client, aelteste fallen raus
+SSE_SLOW_CLIENT_TIMEOUT = 60  # Sekunden dauerhaft voller Puffer -> Client trennen
+SSE_HEARTBEAT_INTERVAL = 30   # Sekunden ohne Update -> Heartbeat
+# Feste Teile der SSE-Frames als Bytes - Frames werden nur noch zusammengesetzt
+_SSE_EVENT = b"event: "
+_SSE_DATA = b"\ndata: "
+_SSE_END = b"\n\n"
+_SSE_CALLS_PREFIX = b"event: calls\ndata: "
+_SSE_RESYNC = b"event: resync\ndata: {}\n\n"
+_SSE_HEARTBEAT = b"event: heartbeat\ndata: {}\n\n"
+
+
+class SSEClient:
+    """
+    Ein verbundener SSE-Client: begrenzter Puffer (neueste Nachricht gewinnt)
+    und ein Event zum Aufwecken des Generators.
+    """
+
+    def __init__(self):
+        self.buf = collections.deque(maxlen=SSE_BUFFER_SIZE)
+        self.evt = threading.Event()
+        self.overflowed = False      # Nachrichten verworfen -> Client muss neu laden
+        self.saturated_since = None  # Seit wann der Puffer voll ist
+        self.closed = False
+
+    def push(self, payload):
+        if len(self.buf) == SSE_BUFFER_SIZE:
+            self.overflowed = True
+            if self.saturated_since is None:
+                self.saturated_since = time.monotonic()
+        self.buf.append(payload)
+        self.evt.set()
+
+    def is_stalled(self, now):
+        return (self.saturated_since is not None
+                and now - self.saturated_since > SSE_SLOW_CLIENT_TIMEOUT)
+
+    def close(self):
+        self.closed = True
+        self.evt.set()
+
+
+def _sse_frame(event_type, data):
+    """Baut einen SSE-Frame als Bytes - einmal pro Update, fuer alle Clients gemeinsam."""
+    return b"".join((_SSE_EVENT, event_type.encode("utf-8"), _SSE_DATA, _json_bytes(data), _SSE_END))
+
+
+def _add_sse_client(client):
+    global sse_clients
+    with sse_lock:
+        sse_clients = sse_clients + (client,)
 
-def broadcast_update(event_type="update", data=None):
-    """Sendet ein Update an alle verbundenen SSE-Clients."""
-    if data is None:
-        data = {}
-    message = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+def _remove_sse_clients(*clients):
+    global sse_clients
+    gone = set(clients)
     with sse_lock:
-        dead_clients = []
-        for client_queue in sse_clients:
-            try:
-                client_queue.put_nowait(message)
-            except queue.Full:
-                dead_clients.append(client_queue)
+        sse_clients = tuple(c for c in sse_clients if c not in gone)
+
+
+def broadcast_update(event_type="update", data=None, payload=None):
+    """
+    Sendet ein Update an alle verbundenen SSE-Clients.
+    payload: bereits fertiger SSE-Frame (bytes); sonst aus event_type/data gebaut.
+    """
+    if payload is None:
+        payload = _sse_frame(event_type, data if data is not None else {})
+
+    # Lock-frei: push() haengt nur an die Deque an und setzt das Event
+    now = time.monotonic()
+    dead_clients = []
+    for client in sse_clients:
+        if client.is_stalled(now):
+            dead_clients.append(client)
+        else:
+            client.push(payload)
+
+    if dead_clients:
+        # Lesen seit SSE_SLOW_CLIENT_TIMEOUT nichts mehr ab
         for dead in dead_clients:
-            sse_clients.remove(dead)
+            dead.close()
+        _remove_sse_clients(*dead_clients)
+
+
+# --- Zwischengespeicherter Dashboard-Stand (Standardansicht: 30 Tage, 50 Anrufe) ---
+# Wird als Ganzes ersetzt (nie veraendert), Leser brauchen daher keinen Lock.
+SNAPSHOT_DAYS = 30
+SNAPSHOT_LIMIT = 50
+_snapshot = {
+    "version": None, "etag": "", "stats_json": b"", "calls_json": b"",
+    "combined_json": b"", "sse_frame": b"", "rows_html": b"",
+}
+_snapshot_lock = threading.Lock()
+# get_stats() rechnet relativ zu 'now' - auch ohne Schreibzugriff spaetestens
+# nach dieser Zeit neu lesen, damit alte Anrufe aus dem Zeitfenster fallen
+SNAPSHOT_MAX_AGE = 3600  # Sekunden
+
+
+def _refresh_snapshot():
+    """
+    Liest Statistik und Anrufliste neu, aber nur wenn sich die Datenbank
+    geaendert hat oder ein neues Zeitfenster (SNAPSHOT_MAX_AGE) begonnen hat.
+    Gibt True zurueck, wenn sich der Inhalt geaendert hat.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        data_version = get_data_version()
+        if data_version is None:
+            # Datenbank existiert (noch) nicht
+            return False
+        version = (data_version, int(time.time() // SNAPSHOT_MAX_AGE))
+        if version == _snapshot["version"]:
+            return False
+
+        stats = get_stats(SNAPSHOT_DAYS)
+        calls = get_recent_calls(SNAPSHOT_LIMIT)
+        stats_json = _json_bytes(stats)
+        calls_json = _json_bytes(calls)
+        etag = hashlib.blake2b(stats_json + b"\n" + calls_json, digest_size=8).hexdigest()
+
+        # Statistik + Anrufe in einem Dokument, aus den fertigen Teilen zusammengesetzt
+        combined_json = b'{"stats": ' + stats_json + b', "calls": ' + calls_json + b"}"
+
+        changed = etag != _snapshot["etag"]
+        _snapshot = {
+            "version": version,
+            "etag": etag,
+            "stats_json": stats_json,
+            "calls_json": calls_json,
+            "combined_json": combined_json,
+            "sse_frame": _SSE_CALLS_PREFIX + combined_json + _SSE_END,
+            "rows_html": _render_rows(calls).encode("utf-8"),
+        }
+        return changed
+
+
+_URGENCY_BADGES = {"hoch": "badge-red", "mittel": "badge-yellow", "niedrig": "badge-green"}
+
+
+def _format_start_time(value):
+    """Zeitstempel wie toLocaleString('de-DE') im Browser."""
+    try:
+        ts = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return value or "-"
+    return f"{ts.day}.{ts.month}.{ts.year}, {ts:%H:%M:%S}"
+
+
+def _field(call, key):
+    """Textfeld eines Anrufs, HTML-escaped; leer -> '-'."""
+    value = call.get(key)
+    return _esc(str(value)) if value else "-"
+
+
+def _render_rows(calls):
+    """Tabellenzeilen der Anrufliste, gleiches Markup wie renderCalls() im JS."""
+    if not calls:
+        return '<tr><td colspan="8" style="text-align:center;color:#64748b;">Noch keine Anrufe</td></tr>'
+
+    parts = []
+    ap = parts.append
+    for call in calls:
+        call_id = _esc(str(call.get("call_id") or ""))
+        ap("<tr><td>")
+        ap(_esc(_format_start_time(call.get("start_time"))))
+        ap("</td><td>")
+        ap(_field(call, "caller_number"))
+        ap("</td><td>")
+        ap(_field(call, "caller_name"))
+        ap("</td><td>")
+        ap(_field(call, "concern"))
+        ap("</td><td>")
+        ap(str(call.get("duration_seconds") or "-"))
+        ap('s</td><td><span class="badge ')
+        ap(_URGENCY_BADGES.get(call.get("urgency"), "badge-blue"))
+        ap('">')
+        ap(_field(call, "urgency"))
+        ap("</span></td><td>")
+        ap('<span class="badge badge-red">Ja</span>' if call.get("callback_requested") else "Nein")
+        ap("</td><td><button class=\"btn\" onclick=\"toggleConversation('")
+        ap(call_id)
+        ap("', this)\">Anzeigen</button><div class=\"conversation\" id=\"conv-")
+        ap(call_id)
+        ap('"></div></td></tr>')
+    return "".join(parts)
+
+
+def _current_snapshot():
+    """
+    Aktueller Stand ohne DB-Zugriff (eine Referenz lesen ist atomar).
+    Nur falls das Vorladen beim Start fehlschlug, wird hier synchron geladen.
+    """
+    snapshot = _snapshot
+    if snapshot["version"] is None:
+        _refresh_snapshot()
+        snapshot = _snapshot
+    return snapshot
+
+
+def _snapshot_response(key):
+    """Antwort aus dem Snapshot mit ETag; 304 wenn der Client den Stand schon hat."""
+    snapshot = _current_snapshot()
+    response = Response(snapshot[key], mimetype="application/json")
+    response.set_etag(snapshot["etag"])
+    response.headers["Cache-Control"] = "max-age=2"
+    return response.make_conditional(request)
+
+
+# Benachrichtigung bei Aenderungen (AGI-Prozesse melden sich nach jedem Schreiben).
+# Lauscht schon ein anderer Worker, bleibt es hier beim Polling.
+_change_listener = open_change_listener()
+SSE_ACTIVE_INTERVAL = 1     # Sekunden, direkt nach einer Aenderung (ohne Benachrichtigung)
+SSE_POLL_INTERVAL = 3       # Sekunden, Basis fuer das Zurueckfahren im Leerlauf
+SSE_FALLBACK_INTERVAL = 30  # Sekunden, Obergrenze bzw. Sicherheitsnetz mit Benachrichtigung
+SSE_MAX_IDLE_TICKS = 8      # Leerlauf-Zaehler deckeln (sonst OverflowError bei 1.5 ** n)
+
+
+def _poll_interval(idle_ticks):
+    """Polling-Abstand: schnell waehrend Aktivitaet, im Leerlauf bis 30s zurueckfahren."""
+    if idle_ticks == 0:
+        return SSE_ACTIVE_INTERVAL
+    return min(SSE_FALLBACK_INTERVAL, SSE_POLL_INTERVAL * 1.5 ** idle_ticks)
+
+
+def _wait_for_change(idle_ticks):
+    """Blockiert bis zur naechsten Aenderungsmeldung (oder Timeout)."""
+    if _change_listener is None:
+        time.sleep(_poll_interval(idle_ticks))
+        return
+    readable, _, _ = select.select([_change_listener], [], [], SSE_FALLBACK_INTERVAL)
+    if readable:
+        # Mehrere Meldungen kurz hintereinander zu einem Update zusammenfassen
+        while True:
+            try:
+                _change_listener.recv(64)
+            except BlockingIOError:
+                break
 
 
 def check_for_new_calls():
-    """Prueft periodisch auf neue Anrufe und sendet SSE-Updates."""
-    global _last_call_count
+    """Sendet SSE-Updates, sobald sich Anrufe aendern."""
+    idle_ticks = 0
     while True:
         try:
-            stats = get_stats(30)
-            current_count = stats.get("total_calls", 0)
-            if current_count != _last_call_count:
-                _last_call_count = current_count
-                calls = get_recent_calls(50)
-                broadcast_update("calls", {"stats": stats, "calls": calls})
+            if _refresh_snapshot():
+                broadcast_update(payload=_snapshot["sse_frame"])
+                idle_ticks = 0
+            else:
+                # Begrenzt: ab 6 Ticks ist die 30s-Obergrenze ohnehin erreicht
+                idle_ticks = min(idle_ticks + 1, SSE_MAX_IDLE_TICKS)
+            _wait_for_change(idle_ticks)
         except Exception as e:
             logger.error(f"SSE check_for_new_calls Fehler: {e}")
-        time.sleep(3)  # Alle 3 Sekunden pruefen
+            time.sleep(SSE_POLL_INTERVAL)
+
 
+# Snapshot vor dem ersten Request laden - auch der erste SSE-Connect
+# (oder ein Reconnect-Sturm) fragt dann nicht selbst die Datenbank ab
+try:
+    _refresh_snapshot()
+except Exception as e:
+    logger.warning(f"Dashboard-Snapshot konnte nicht vorgeladen werden: {e}")
 
 # Hintergrund-Thread starten fuer Anruf-Updates
 _sse_thread = threading.Thread(target=check_for_new_calls, daemon=True)
@@ -76,6 +345,7 @@ _sse_thread.start()
 
 # --- Admin-Auth (HTTP Basic Auth fuer Admin-Dashboard) ---
 ADMIN_PASSWORD = config.get("admin_password", "")
+ADMIN_PASSWORD_B = ADMIN_PASSWORD.encode("utf-8")
 
 
 def require_admin(f):
@@ -86,7 +356,10 @@ def require_admin(f):
             # Kein Passwort gesetzt = kein Schutz (Entwicklungsmodus)
             return f(*args, **kwargs)
         auth = request.authorization
-        if not auth or auth.password != ADMIN_PASSWORD:
+        # Konstante Laufzeit: kein Timing-Leck ueber Laenge/Praefix
+        if not auth or not hmac.compare_digest(
+            (auth.password or "").encode("utf-8"), ADMIN_PASSWORD_B
+        ):
             return Response(
                 "Zugang verweigert. Bitte Admin-Passwort eingeben.",
                 401,
@@ -95,6 +368,11 @@ def require_admin(f):
         return f(*args, **kwargs)
     return decorated
 
+# CORS nur fuer Booking-API und Kunden-API - Admin-Routen (SSE, Stats)
+# laufen so nicht durch den CORS-Hook
+CORS(booking_api, origins="*")
+CORS(customer_api, origins="*")
+
 # Booking-Module registrieren
 app.register_blueprint(booking_api)
 app.register_blueprint(booking_dashboard)
@@ -297,9 +575,7 @@ DASHBOARD_HTML = """
                         <th>Details</th>
                     </tr>
                 </thead>
-                <tbody id="calls-table">
-                    <tr><td colspan="8" style="text-align:center;color:#64748b;">Lade Daten...</td></tr>
-                </tbody>
+                <tbody id="calls-table"><!--ROWS--></tbody>
             </table>
         </div>
     </div>
@@ -351,6 +627,11 @@ DASHBOARD_HTML = """
                 // Verbindung ist aktiv
             });
 
+            eventSource.addEventListener('resync', function(e) {
+                // Server hat Updates verworfen (Client zu langsam) - neu laden
+                loadData();
+            });
+
             eventSource.onerror = function(e) {
                 console.error('SSE Fehler:', e);
                 eventSource.close();
@@ -374,19 +655,8 @@ DASHBOARD_HTML = """
 
         async function loadData() {
             try {
-                const [statsResp, callsResp] = await Promise.all([
-                    fetch('/api/stats'),
-                    fetch('/api/calls')
-                ]);
-                const stats = await statsResp.json();
-                const calls = await callsResp.json();
-
-                document.getElementById('stat-total').textContent = stats.total_calls;
-                document.getElementById('stat-duration').textContent = stats.avg_duration;
-                document.getElementById('stat-callbacks').textContent = stats.callbacks_requested;
-                document.getElementById('stat-appointments').textContent = stats.appointments_requested;
-
-                renderCalls(calls);
+                const resp = await fetch('/api/snapshot');
+                updateDashboard(await resp.json());
             } catch (err) {
                 console.error('Fehler beim Laden:', err);
             }
@@ -463,27 +733,100 @@ DASHBOARD_HTML = """
 """
 
 
+# Statischer Rahmen einmal kodiert; pro Aufruf werden nur die Zeilen aus dem Snapshot eingesetzt
+_DASHBOARD_HEAD, _DASHBOARD_TAIL = DASHBOARD_HTML.encode("utf-8").split(b"<!--ROWS-->")
+_DASHBOARD_ETAG = hashlib.md5(DASHBOARD_HTML.encode("utf-8")).hexdigest()
+
+
+# Fertige Seite je Snapshot, roh und vorkomprimiert: (snapshot-etag, {encoding: bytes})
+_dashboard_pages = ("", {})
+
+
+def _dashboard_bodies(snapshot):
+    """Seite fuer den Snapshot; komprimiert wird nur einmal pro Datenstand."""
+    global _dashboard_pages
+    etag, bodies = _dashboard_pages
+    if etag != snapshot["etag"]:
+        page = _DASHBOARD_HEAD + snapshot["rows_html"] + _DASHBOARD_TAIL
+        bodies = {"identity": page, "gzip": gzip.compress(page, 9)}
+        if brotli is not None:
+            bodies["br"] = brotli.compress(page, quality=11)
+        _dashboard_pages = (snapshot["etag"], bodies)
+    return bodies
+
+
 @app.route("/")
 @require_admin
 def dashboard():
-    """Haupt-Dashboard."""
-    return render_template_string(DASHBOARD_HTML)
+    """Haupt-Dashboard (Anrufliste ist schon im HTML, SSE liefert Updates)."""
+    snapshot = _current_snapshot()
+    bodies = _dashboard_bodies(snapshot)
+    accepted = request.accept_encodings
+    encoding = next(
+        (enc for enc in ("br", "gzip") if enc in bodies and accepted[enc]), "identity"
+    )
+    response = Response(bodies[encoding], mimetype="text/html")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.set_etag(f"{_DASHBOARD_ETAG}-{snapshot['etag']}", weak=True)
+    # private: Seite liegt hinter Basic Auth, geteilte Caches sollen sie nicht speichern.
+    # no-cache: Zeilen aendern sich, daher immer per ETag revalidieren (meist 304)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+
+# Gaengige Query-Werte direkt per Dict nachschlagen; deren Ergebnis wird je Datenstand gecacht
+_DAY_BUCKETS = {"7": 7, "14": 14, "30": 30, "90": 90}
+_LIMIT_BUCKETS = {"25": 25, "50": 50, "100": 100, "200": 200}
+_bucket_cache = (None, {})  # (snapshot-version, {(name, wert): json-bytes})
+
+
+def _bucket_response(name, value, loader):
+    """JSON fuer einen Standardwert, pro DB-Version nur einmal abgefragt."""
+    global _bucket_cache
+    version = _current_snapshot()["version"]
+    cached_version, cached = _bucket_cache
+    if cached_version != version:
+        cached = {}
+        _bucket_cache = (version, cached)
+    body = cached.get((name, value))
+    if body is None:
+        body = cached[(name, value)] = _json_bytes(loader(value))
+    return Response(body, mimetype="application/json")
 
 
 @app.route("/api/stats")
 @require_admin
 def api_stats():
     """Statistik-API."""
-    days = request.args.get("days", 30, type=int)
-    return jsonify(get_stats(days))
+    raw = request.args.get("days")
+    days = SNAPSHOT_DAYS if raw is None else _DAY_BUCKETS.get(raw)
+    if days == SNAPSHOT_DAYS:
+        return _snapshot_response("stats_json")
+    if days is not None:
+        return _bucket_response("days", days, get_stats)
+    return jsonify(get_stats(request.args.get("days", 30, type=int)))
 
 
 @app.route("/api/calls")
 @require_admin
 def api_calls():
     """Letzte Anrufe."""
-    limit = request.args.get("limit", 50, type=int)
-    return jsonify(get_recent_calls(limit))
+    raw = request.args.get("limit")
+    limit = SNAPSHOT_LIMIT if raw is None else _LIMIT_BUCKETS.get(raw)
+    if limit == SNAPSHOT_LIMIT:
+        return _snapshot_response("calls_json")
+    if limit is not None:
+        return _bucket_response("limit", limit, get_recent_calls)
+    return jsonify(get_recent_calls(request.args.get("limit", 50, type=int)))
+
+
+@app.route("/api/snapshot")
+@require_admin
+def api_snapshot():
+    """Statistik und letzte Anrufe in einer Antwort (wie der SSE-Frame)."""
+    return _snapshot_response("combined_json")
 
 
 @app.route("/api/calls/<call_id>/messages")
@@ -505,26 +848,27 @@ def api_businesses():
 def api_sse():
     """Server-Sent Events Endpoint fuer Echtzeit-Updates."""
     def generate():
-        client_queue = queue.Queue(maxsize=10)
-        with sse_lock:
-            sse_clients.append(client_queue)
+        client = SSEClient()
+        _add_sse_client(client)
         try:
-            # Initiale Daten senden
-            stats = get_stats(30)
-            calls = get_recent_calls(50)
-            yield f"event: calls\ndata: {json.dumps({'stats': stats, 'calls': calls})}\n\n"
-
-            while True:
-                try:
-                    message = client_queue.get(timeout=30)
-                    yield message
-                except queue.Empty:
+            # Initiale Daten senden (vorkodierter Frame aus dem Snapshot, keine DB-Abfrage)
+            yield _current_snapshot()["sse_frame"]
+
+            while not client.closed:
+                if not client.evt.wait(timeout=SSE_HEARTBEAT_INTERVAL):
                     # Heartbeat senden um Verbindung aufrecht zu erhalten
-                    yield f"event: heartbeat\ndata: {{}}\n\n"
+                    yield _SSE_HEARTBEAT
+                    continue
+                client.evt.clear()
+                if client.overflowed:
+                    # Nachrichten wurden verworfen - Client laedt den Stand neu
+                    client.overflowed = False
+                    yield _SSE_RESYNC
+                while client.buf:
+                    yield client.buf.popleft()
+                client.saturated_since = None
         finally:
-            with sse_lock:
-                if client_queue in sse_clients:
-                    sse_clients.remove(client_queue)
+            _remove_sse_clients(client)
 
     return Response(
         generate(),
@@ -538,6 +882,10 @@ def api_sse():
 
 
 if __name__ == "__main__":
+    # Nur fuer lokale Entwicklung. Produktion (SSE mit vielen Clients):
+    #   gunicorn -k gevent -w 1 --worker-connections 1000 -b :5000 src.web_dashboard:app
+    # gevent patcht threading/select/socket, Update-Thread und SSE-Waits
+    # laufen dann kooperativ in einem Event-Loop statt je ein OS-Thread.
     init_database()
     init_booking_tables()
 